@@ -5,10 +5,6 @@ import os
 import logging
 from datetime import datetime
 from typing import Dict, Any
-import sys
-
-# Add parent directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from shared.response import success_response, error_response, validation_error_response
 from shared.validators import validate_email, validate_password, validate_required_fields
@@ -4,10 +4,6 @@ import json
 import os
 import logging
 from typing import Dict, Any
-import sys
-
-# Add parent directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from shared.response import success_response, error_response, validation_error_response, not_found_response
 from shared.validators import validate_required_fields
@@ -6,7 +6,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 import logging
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Key, Attr
 
 from shared.dynamodb import DynamoDBClient
 from shared.validators import (
@@ -305,8 +305,6 @@ class BudgetService:
         end_date_str = end_date.strftime('%Y-%m-%d')
 
         # Query expenses for category in date range
-        from boto3.dynamodb.conditions import Attr
-
         result = self.expenses_table.query(
             key_condition_expression=Key('user_id').eq(user_id) & Key('category').eq(category),
             filter_expression=Attr('date').between(start_date_str, end_date_str),
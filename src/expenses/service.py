@@ -4,6 +4,7 @@ import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
+from decimal import Decimal
 import logging
 from boto3.dynamodb.conditions import Key, Attr
 
@@ -15,9 +16,14 @@ from shared.validators import (
     sanitize_string
 )
 from shared.exceptions import ValidationError, NotFoundError
+from shared.report_cache import invalidate_user_reports
 
 logger = logging.getLogger(__name__)
 
+# Attributes read by get_summary ('date' is a reserved word)
+SUMMARY_PROJECTION = 'amount, category, #date'
+DATE_ATTRIBUTE_NAMES = {'#date': 'date'}
+
 
 class ExpenseService:
     """Service for managing expenses."""
@@ -134,8 +140,10 @@ class ExpenseService:
         user_id: str,
         start_date: Optional[str],
         end_date: Optional[str],
-        limit: int,
-        last_evaluated_key: Optional[Dict[str, Any]]
+        limit: Optional[int],
+        last_evaluated_key: Optional[Dict[str, Any]],
+        projection_expression: Optional[str] = None,
+        expression_names: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """Query expenses by date range."""
         # Build key condition with date range
@@ -153,7 +161,9 @@ class ExpenseService:
             index_name='user-date-index',
             limit=limit,
             scan_forward=False,
-            exclusive_start_key=last_evaluated_key
+            exclusive_start_key=last_evaluated_key,
+            projection_expression=projection_expression,
+            expression_names=expression_names
         )
 
     def update_expense(
@@ -220,6 +230,7 @@ class ExpenseService:
             expression_values=expr_values,
             expression_names=expr_names
         )
+        invalidate_user_reports(user_id)
 
         logger.info(f"Updated expense {expense_id}")
         return updated_expense
@@ -243,6 +254,7 @@ class ExpenseService:
             'user_id': user_id,
             'expense_id': expense_id
         })
+        invalidate_user_reports(user_id)
 
         logger.info(f"Deleted expense {expense_id}")
 
@@ -268,53 +280,49 @@ class ExpenseService:
             end_date = datetime.utcnow().strftime('%Y-%m-%d')
             start_date = (datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%d')
 
-        # Fetch expenses
-        expenses = []
+        # Aggregate page by page in exact decimal arithmetic
+        total_amount = Decimal(0)
+        expense_count = 0
+        by_category = defaultdict(Decimal)
+        by_month = defaultdict(Decimal)
         last_key = None
 
         while True:
-            result = self.list_expenses(
-                user_id=user_id,
-                start_date=start_date,
-                end_date=end_date,
-                limit=100,
-                last_evaluated_key=last_key
+            result = self._query_by_date_range(
+                user_id,
+                start_date,
+                end_date,
+                limit=None,
+                last_evaluated_key=last_key,
+                projection_expression=SUMMARY_PROJECTION,
+                expression_names=DATE_ATTRIBUTE_NAMES
             )
 
-            expenses.extend(result['expenses'])
-            last_key = result.get('last_evaluated_key')
+            for expense in result['items']:
+                amount = Decimal(str(expense.get('amount', 0)))
+                total_amount += amount
+                expense_count += 1
 
-            if not last_key:
-                break
-
-        # Calculate summary
-        total_amount = 0.0
-        by_category = defaultdict(float)
-        by_month = defaultdict(float)
-
-        for expense in expenses:
-            amount = float(expense.get('amount', 0))
-            total_amount += amount
+                # Group by category
+                by_category[expense.get('category', 'Other')] += amount
 
-            # Group by category
-            category = expense.get('category', 'Other')
-            by_category[category] += amount
+                # Group by month
+                date_str = expense.get('date', '')
+                if date_str:
+                    by_month[date_str[:7]] += amount  # YYYY-MM
 
-            # Group by month
-            date_str = expense.get('date', '')
-            if date_str:
-                month = date_str[:7]  # YYYY-MM
-                by_month[month] += amount
+            last_key = result.get('last_evaluated_key')
+            if not last_key:
+                break
 
-        expense_count = len(expenses)
-        average_expense = total_amount / expense_count if expense_count > 0 else 0.0
+        average_expense = total_amount / expense_count if expense_count > 0 else Decimal(0)
 
         return {
-            'total_amount': round(total_amount, 2),
+            'total_amount': float(round(total_amount, 2)),
             'expense_count': expense_count,
-            'average_expense': round(average_expense, 2),
-            'by_category': {k: round(v, 2) for k, v in by_category.items()},
-            'by_month': {k: round(v, 2) for k, v in by_month.items()},
+            'average_expense': float(round(average_expense, 2)),
+            'by_category': {k: float(round(v, 2)) for k, v in by_category.items()},
+            'by_month': {k: float(round(v, 2)) for k, v in by_month.items()},
             'start_date': start_date,
             'end_date': end_date
         }
@@ -6,13 +6,10 @@ import logging
 from typing import Dict, Any
 from datetime import datetime
 import uuid
-import sys
-
-# Add parent directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from shared.dynamodb import DynamoDBClient
 from shared.s3 import S3Client
+from shared.report_cache import invalidate_user_reports
 from ocr_processor.textract_service import TextractService
 from ocr_processor.comprehend_service import ComprehendService
 from ocr_processor.parser import ReceiptParser
@@ -199,6 +196,7 @@ def create_expense_record(
 
     # Save to DynamoDB
     expenses_table.put_item(expense)
+    invalidate_user_reports(user_id)
 
     logger.info(f"Created expense record: {expense_id}")
     return expense_id
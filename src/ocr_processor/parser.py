@@ -1,28 +1,45 @@
 """Parser for OCR results."""
 
 import logging
+import math
+import re
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+# Amounts above this are treated as OCR misreads
+MAX_RECEIPT_AMOUNT = 999999.99
+
+# Trailing company suffixes stripped from merchant names (any case, optional dot)
+_MERCHANT_SUFFIX_RE = re.compile(
+    r'(?:\s+(?:inc|llc|ltd|corp|corporation)\.?)+$',
+    re.IGNORECASE
+)
+
 
 class ReceiptParser:
     """Parser for receipt OCR results."""
 
     @staticmethod
-    def validate_and_clean(ocr_data: Dict[str, Any]) -> Dict[str, Any]:
+    def validate_and_clean(
+        ocr_data: Dict[str, Any],
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Validate and clean OCR data.
 
         Args:
             ocr_data: Raw OCR data from Textract
+            now: Optional current UTC time, shared by all date checks
 
         Returns:
             Cleaned and validated data
         """
         cleaned = ocr_data.copy()
+        now = now or datetime.utcnow()
 
         # Validate and fix amount
         if cleaned.get('total'):
@@ -56,11 +73,11 @@ class ReceiptParser:
 
         # Validate and fix date
         if cleaned.get('date'):
-            cleaned['date'] = ReceiptParser._validate_date(cleaned['date'])
+            cleaned['date'] = ReceiptParser._validate_date(cleaned['date'], now)
 
         # If date is missing, try to infer from current date (use today as default)
         if not cleaned.get('date'):
-            cleaned['date'] = datetime.utcnow().strftime('%Y-%m-%d')
+            cleaned['date'] = now.strftime('%Y-%m-%d')
             logger.info(f"Using current date as receipt date: {cleaned['date']}")
 
         # Clean merchant name
@@ -79,35 +96,43 @@ class ReceiptParser:
 
     @staticmethod
     def _validate_amount(amount: Any) -> Optional[float]:
-        """Validate and convert amount to float."""
+        """Validate and convert amount to a non-negative float."""
         if amount is None:
             return None
 
         try:
-            value = float(amount)
-            if value < 0:
-                logger.warning(f"Negative amount detected: {value}")
-                return abs(value)
-            if value > 999999.99:
-                logger.warning(f"Extremely large amount detected: {value}")
-                return None
-            return round(value, 2)
+            value = abs(float(amount))
         except (ValueError, TypeError):
             logger.warning(f"Invalid amount value: {amount}")
             return None
 
+        # One range check covers too-large, NaN and infinite amounts
+        if math.isfinite(value) and value <= MAX_RECEIPT_AMOUNT:
+            return value
+
+        logger.warning(f"Out-of-range amount detected: {amount}")
+        return None
+
     @staticmethod
-    def _validate_date(date_str: str) -> Optional[str]:
-        """Validate and normalize date string."""
+    def _validate_date(date_str: str, now: Optional[datetime] = None) -> Optional[str]:
+        """Validate and normalize date string (now defaults to the current UTC time)."""
         if not date_str:
             return None
 
         try:
-            # Parse date
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+            # Parse date, reading YYYY-MM-DD by fixed offsets when possible
+            if (
+                len(date_str) == 10
+                and date_str[4] == '-'
+                and date_str[7] == '-'
+                and (date_str[:4] + date_str[5:7] + date_str[8:]).isdigit()
+            ):
+                date_obj = datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+            else:
+                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
 
             # Check if date is reasonable (not in future, not too old)
-            now = datetime.utcnow()
+            now = now or datetime.utcnow()
             if date_obj > now:
                 logger.warning(f"Future date detected: {date_str}, using today")
                 return now.strftime('%Y-%m-%d')
@@ -123,24 +148,26 @@ class ReceiptParser:
             return None
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _clean_merchant_name(merchant: str) -> str:
-        """Clean merchant name."""
+        """Clean merchant name (cached, as the same chains recur across receipts)."""
         if not merchant:
             return "Unknown Merchant"
 
         # Remove extra whitespace
         cleaned = ' '.join(merchant.split())
 
-        # Capitalize properly
-        cleaned = cleaned.title()
-
         # Remove common suffixes
-        suffixes_to_remove = [' Inc', ' Inc.', ' LLC', ' Ltd', ' Corp', ' Corporation']
-        for suffix in suffixes_to_remove:
-            if cleaned.endswith(suffix):
-                cleaned = cleaned[:-len(suffix)]
+        cleaned = _MERCHANT_SUFFIX_RE.sub('', cleaned)
+
+        # Capitalize properly
+        return cleaned.title() or "Unknown Merchant"
 
-        return cleaned.strip() or "Unknown Merchant"
+    @staticmethod
+    @lru_cache(maxsize=16384)
+    def _clean_description(description: str) -> str:
+        """Collapse whitespace in an item description (cached, as staple items recur)."""
+        return ' '.join(description.split())
 
     @staticmethod
     def _clean_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -149,7 +176,7 @@ class ReceiptParser:
             return None
 
         cleaned = {
-            'description': item['description'].strip(),
+            'description': ReceiptParser._clean_description(item['description']),
             'quantity': item.get('quantity'),
             'price': ReceiptParser._validate_amount(item.get('price')),
             'amount': ReceiptParser._validate_amount(item.get('amount'))
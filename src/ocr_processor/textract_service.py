@@ -4,6 +4,7 @@ import os
 import boto3
 from typing import Dict, Any, List
 from botocore.exceptions import ClientError
+from dateutil import parser as date_parser
 import logging
 
 logger = logging.getLogger(__name__)
@@ -260,9 +261,8 @@ class TextractService:
         if not value:
             return None
 
-        from dateutil import parser
         try:
-            parsed_date = parser.parse(value, fuzzy=True)
+            parsed_date = date_parser.parse(value, fuzzy=True)
             # Return in ISO format (YYYY-MM-DD)
             return parsed_date.strftime('%Y-%m-%d')
         except Exception:
@@ -5,6 +5,7 @@ import uuid
 from datetime import datetime
 from typing import Dict, Any
 import logging
+from boto3.dynamodb.conditions import Key
 
 from shared.s3 import S3Client
 from shared.dynamodb import DynamoDBClient
@@ -18,11 +19,14 @@ from shared.exceptions import ValidationError, StorageError
 logger = logging.getLogger(__name__)
 
 # Allowed image extensions
-ALLOWED_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.pdf']
+ALLOWED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.pdf')
 
 # Maximum file size (5MB)
 MAX_FILE_SIZE_MB = 5
 
+# Presigned image URLs are valid for 1 hour (S3Client reuses them for up to 45 minutes)
+IMAGE_URL_EXPIRATION = 3600
+
 
 class ReceiptUploadService:
     """Service for handling receipt uploads."""
@@ -62,7 +66,6 @@ class ReceiptUploadService:
         clean_image_data = validate_base64_image(image_data)
 
         # Estimate file size (base64 is ~1.33x larger than binary)
-        import base64
         estimated_size = len(clean_image_data) * 0.75
         validate_file_size(int(estimated_size), MAX_FILE_SIZE_MB)
 
@@ -140,8 +143,7 @@ class ReceiptUploadService:
 
         # Generate presigned URL for image
         receipt['image_url'] = self.s3_client.get_presigned_url(
-            receipt['s3_key'],
-            expiration=3600
+            receipt['s3_key'], expiration=IMAGE_URL_EXPIRATION
         )
 
         return receipt
@@ -163,8 +165,6 @@ class ReceiptUploadService:
         Returns:
             Dictionary with receipts and pagination key
         """
-        from boto3.dynamodb.conditions import Key
-
         result = self.receipts_table.query(
             key_condition_expression=Key('user_id').eq(user_id),
             limit=limit,
@@ -175,8 +175,7 @@ class ReceiptUploadService:
         # Add presigned URLs to receipts
         for receipt in result['items']:
             receipt['image_url'] = self.s3_client.get_presigned_url(
-                receipt['s3_key'],
-                expiration=3600
+                receipt['s3_key'], expiration=IMAGE_URL_EXPIRATION
             )
 
         return {
@@ -0,0 +1,66 @@
+"""Merchant name deduplication for report grouping."""
+
+import re
+from typing import Dict, List, Tuple
+
+# Trailing words that describe the kind of outlet rather than the merchant,
+# so "CVS Pharmacy" and "Walmart Supercenter" group with "CVS" and "Walmart"
+DESCRIPTOR_WORDS = frozenset({
+    'cafe', 'com', 'market', 'online', 'outlet', 'pharmacy', 'shop',
+    'store', 'stores', 'supercenter', 'supermarket', 'superstore', 'wholesale'
+})
+
+_LEGAL_WORDS = frozenset({'co', 'company', 'corp', 'corporation', 'inc', 'llc', 'ltd'})
+_STORE_NUMBER_RE = re.compile(r'\s+(?:store\s*)?(?:no\.?\s*|#\s*)\d+$')
+_APOSTROPHE_RE = re.compile(r"['\u2019]")
+_PUNCTUATION_RE = re.compile(r'[^\w\s]+')
+
+
+def _merchant_key(name: str) -> Tuple[str, ...]:
+    """
+    Reduce a merchant name to the word tokens that identify the merchant.
+
+    Store numbers, punctuation, legal forms, a leading "the" and trailing
+    outlet descriptors are dropped (apostrophes join rather than split
+    words). Tokens are never shortened, so "Shellfish" and "Targetta"
+    keep their own keys.
+
+    Args:
+        name: Merchant name as stored on the expense
+
+    Returns:
+        Tuple of lower-case tokens (the raw lower-cased name if none remain)
+    """
+    cleaned = _STORE_NUMBER_RE.sub('', name.lower().strip())
+    cleaned = _APOSTROPHE_RE.sub('', cleaned)
+    tokens = _PUNCTUATION_RE.sub(' ', cleaned).split()
+
+    while tokens and tokens[-1] in _LEGAL_WORDS:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == 'the':
+        tokens.pop(0)
+    while len(tokens) > 1 and tokens[-1] in DESCRIPTOR_WORDS:
+        tokens.pop()
+        while len(tokens) > 1 and tokens[-1] in _LEGAL_WORDS:
+            tokens.pop()
+
+    return tuple(tokens) or (name.lower(),)
+
+
+def canonicalize(names: List[str]) -> Dict[str, str]:
+    """
+    Map merchant names onto canonical labels.
+
+    Names with the same word-token key are merged, so "WALMART INC.",
+    "Walmart Store #123" and "Walmart Supercenter" group with "Walmart".
+    Other differing words keep merchants apart, e.g. "Costco" and
+    "Costco Gas" or "Store1" and "Store2".
+
+    Args:
+        names: Merchant names; earlier names win as a group's label
+
+    Returns:
+        Mapping of every input name to its canonical label
+    """
+    labels: Dict[Tuple[str, ...], str] = {}
+    return {name: labels.setdefault(_merchant_key(name), name) for name in names}
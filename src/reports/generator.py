@@ -1,33 +1,149 @@
 """Report generation utilities."""
 
+import heapq
+import html
+import math
 import os
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
-from collections import defaultdict
+import time
+from typing import Dict, Any, Iterator, List, Optional, TextIO, Tuple
+from datetime import datetime, date, timedelta
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 import logging
 from io import StringIO
 import csv
+from boto3.dynamodb.conditions import Key
 
-from shared.dynamodb import DynamoDBClient
+from reports._dedup import canonicalize
+from shared.clients import get_table
+from shared.exceptions import DatabaseError, ThrottleError
+from shared.report_cache import REPORT_CACHE_TTL, REPORT_VERSION_KEY, get_report_cache
+from shared.response import from_json, to_json
 
 logger = logging.getLogger(__name__)
 
+# Attributes fetched for reports and CSV exports ('date' and 'items' are reserved words)
+REPORT_PROJECTION = 'amount, category, merchant, #date'
+EXPORT_PROJECTION = 'amount, category, merchant, #date, #items, receipt_id, created_at'
+DATE_ATTRIBUTE_NAMES = {'#date': 'date'}
+EXPORT_ATTRIBUTE_NAMES = {'#date': 'date', '#items': 'items'}
+
+# Concurrent date-range queries per report (1 keeps a single serial query)
+REPORT_QUERY_SHARDS = int(os.environ.get('REPORT_QUERY_SHARDS', '1'))
+
+EXPORT_HEADER = ('Date', 'Merchant', 'Category', 'Amount', 'Items', 'Receipt ID', 'Created At')
+
+# Email report markup, filled in with str.format by format_report_html
+CATEGORY_ROW_TEMPLATE = """\
+<tr>
+    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0;">{name}</td>
+    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">${amount:.2f}</td>
+    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">{count}</td>
+    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">{percentage:.1f}%</td>
+</tr>
+"""
+
+MERCHANT_ROW_TEMPLATE = """\
+<tr>
+    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0;">{name}</td>
+    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">${amount:.2f}</td>
+    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">{count}</td>
+</tr>
+"""
+
+REPORT_HTML_TEMPLATE = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{report_type} Expense Report</title>
+</head>
+<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
+    <div style="background-color: #4CAF50; color: white; padding: 20px; text-align: center; border-radius: 8px 8px 0 0;">
+        <h1 style="margin: 0;">{report_type} Expense Report</h1>
+        <p style="margin: 10px 0 0 0;">{start_date} to {end_date}</p>
+    </div>
+
+    <div style="background-color: #f9f9f9; padding: 20px; border: 1px solid #e0e0e0;">
+        <h2 style="color: #4CAF50; margin-top: 0;">Summary</h2>
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px;">
+            <div style="background-color: white; padding: 15px; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <h3 style="margin: 0 0 10px 0; color: #666; font-size: 14px;">Total Expenses</h3>
+                <p style="margin: 0; font-size: 28px; font-weight: bold; color: #4CAF50;">${total_amount:.2f}</p>
+            </div>
+            <div style="background-color: white; padding: 15px; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <h3 style="margin: 0 0 10px 0; color: #666; font-size: 14px;">Number of Expenses</h3>
+                <p style="margin: 0; font-size: 28px; font-weight: bold; color: #2196F3;">{expense_count}</p>
+            </div>
+        </div>
+    </div>
+
+    <div style="background-color: white; padding: 20px; border: 1px solid #e0e0e0; border-top: none;">
+        <h2 style="color: #4CAF50;">Expenses by Category</h2>
+        <table style="width: 100%; border-collapse: collapse;">
+            <thead>
+                <tr style="background-color: #f5f5f5;">
+                    <th style="padding: 10px; text-align: left; border-bottom: 2px solid #4CAF50;">Category</th>
+                    <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Amount</th>
+                    <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Count</th>
+                    <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Percentage</th>
+                </tr>
+            </thead>
+            <tbody>
+                {category_rows}
+            </tbody>
+        </table>
+    </div>
+
+    <div style="background-color: white; padding: 20px; border: 1px solid #e0e0e0; border-top: none;">
+        <h2 style="color: #4CAF50;">Top Merchants</h2>
+        <table style="width: 100%; border-collapse: collapse;">
+            <thead>
+                <tr style="background-color: #f5f5f5;">
+                    <th style="padding: 10px; text-align: left; border-bottom: 2px solid #4CAF50;">Merchant</th>
+                    <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Amount</th>
+                    <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Transactions</th>
+                </tr>
+            </thead>
+            <tbody>
+                {merchant_rows}
+            </tbody>
+        </table>
+    </div>
+
+    <div style="background-color: #f9f9f9; padding: 20px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 8px 8px; text-align: center; color: #666; font-size: 12px;">
+        <p>Report generated on {generated_at} UTC</p>
+        <p>Smart Expense Tracker - Your Personal Finance Assistant</p>
+    </div>
+</body>
+</html>
+"""
+
 
 class ReportGenerator:
     """Service for generating expense reports."""
 
     def __init__(self):
         """Initialize report generator."""
-        self.expenses_table = DynamoDBClient(os.environ.get('EXPENSES_TABLE'))
-        self.budgets_table = DynamoDBClient(os.environ.get('BUDGETS_TABLE'))
-        self.users_table = DynamoDBClient(os.environ.get('USERS_TABLE'))
+        self.expenses_table = get_table(os.environ.get('EXPENSES_TABLE'))
+        self.budgets_table = get_table(os.environ.get('BUDGETS_TABLE'))
+        self.users_table = get_table(os.environ.get('USERS_TABLE'))
+
+        # Optional cache of finished reports (expired items are removed by DynamoDB TTL)
+        self.report_cache = get_report_cache()
 
-    def generate_weekly_report(self, user_id: str) -> Dict[str, Any]:
+    def generate_weekly_report(
+        self,
+        user_id: str,
+        user: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Generate weekly expense report.
 
         Args:
             user_id: User ID
+            user: User's email and name, if the caller already fetched them
 
         Returns:
             Weekly report data
@@ -40,15 +156,21 @@ class ReportGenerator:
             user_id=user_id,
             start_date=start_date.strftime('%Y-%m-%d'),
             end_date=end_date.strftime('%Y-%m-%d'),
-            report_type='weekly'
+            report_type='weekly',
+            user=user
         )
 
-    def generate_monthly_report(self, user_id: str) -> Dict[str, Any]:
+    def generate_monthly_report(
+        self,
+        user_id: str,
+        user: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Generate monthly expense report.
 
         Args:
             user_id: User ID
+            user: User's email and name, if the caller already fetched them
 
         Returns:
             Monthly report data
@@ -61,7 +183,8 @@ class ReportGenerator:
             user_id=user_id,
             start_date=start_date.strftime('%Y-%m-%d'),
             end_date=end_date.strftime('%Y-%m-%d'),
-            report_type='monthly'
+            report_type='monthly',
+            user=user
         )
 
     def _generate_report(
@@ -69,80 +192,166 @@ class ReportGenerator:
         user_id: str,
         start_date: str,
         end_date: str,
-        report_type: str
+        report_type: str,
+        user: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
-        Generate expense report for date range.
+        Generate expense report for date range, using the report cache if enabled.
+
+        Cache failures are logged and never fail the report.
 
         Args:
             user_id: User ID
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             report_type: Report type (weekly/monthly)
+            user: User's email and name (looked up when not given)
 
         Returns:
             Report data
         """
-        from boto3.dynamodb.conditions import Key, Attr
-
-        # Fetch expenses for date range
-        expenses = []
-        last_key = None
+        if not self.report_cache:
+            return self._build_report(user_id, start_date, end_date, report_type, user)
+
+        report_key = f"{report_type}#{start_date}#{end_date}"
+
+        # Read the report and the user's version stamp in one round trip
+        stamp = None
+        try:
+            rows = {
+                row['report_key']: row
+                for row in self.report_cache.batch_get([
+                    {'user_id': user_id, 'report_key': report_key},
+                    {'user_id': user_id, 'report_key': REPORT_VERSION_KEY}
+                ])
+            }
+            stamp = rows.get(REPORT_VERSION_KEY, {}).get('stamp')
+            cached = rows.get(report_key)
+            if (
+                cached
+                and 'report_json' in cached
+                and cached.get('expires_at', 0) > time.time()
+                and cached.get('stamp') == stamp
+            ):
+                report = from_json(cached['report_json'])
+                if user is not None:
+                    report['user'] = _user_summary(user_id, user)
+                return report
+        except (DatabaseError, ThrottleError) as e:
+            logger.warning("Report cache read failed: %s", e)
+            return self._build_report(user_id, start_date, end_date, report_type, user)
+
+        report = self._build_report(user_id, start_date, end_date, report_type, user)
+
+        # Stored under the stamp read before building, so a write made
+        # meanwhile leaves this entry stale rather than serving it. The
+        # report is kept as JSON so its floats don't come back as Decimals.
+        try:
+            self.report_cache.put_item({
+                'user_id': user_id,
+                'report_key': report_key,
+                'report_json': to_json(report),
+                'stamp': stamp,
+                'expires_at': int(time.time()) + REPORT_CACHE_TTL
+            })
+        except (DatabaseError, ThrottleError) as e:
+            logger.warning("Report cache write failed: %s", e)
 
-        while True:
-            result = self.expenses_table.query(
-                key_condition_expression=Key('user_id').eq(user_id) & Key('date').between(start_date, end_date),
-                index_name='user-date-index',
-                limit=100,
-                exclusive_start_key=last_key
-            )
+        return report
 
-            expenses.extend(result['items'])
-            last_key = result.get('last_evaluated_key')
+    def _build_report(
+        self,
+        user_id: str,
+        start_date: str,
+        end_date: str,
+        report_type: str,
+        user: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build expense report for date range.
 
-            if not last_key:
-                break
+        Args:
+            user_id: User ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            report_type: Report type (weekly/monthly)
+            user: User's email and name (looked up when not given)
 
-        # Calculate statistics
-        total_amount = 0.0
-        by_category = defaultdict(lambda: {'amount': 0.0, 'count': 0})
-        by_merchant = defaultdict(lambda: {'amount': 0.0, 'count': 0})
+        Returns:
+            Report data
+        """
+        # Aggregate each page as it arrives instead of keeping every expense
+        # (only the amounts are kept, for a single exact fsum)
+        amounts = []
+        expense_count = 0
+        category_amounts = Counter()
+        category_counts = Counter()
+        merchant_amounts = Counter()
+        merchant_counts = Counter()
         by_date = defaultdict(float)
 
-        for expense in expenses:
-            amount = float(expense.get('amount', 0))
-            category = expense.get('category', 'Other')
-            merchant = expense.get('merchant', 'Unknown')
-            date = expense.get('date', '')
+        for items in self._iter_report_pages(user_id, start_date, end_date):
+            for expense in items:
+                amount = float(expense.get('amount', 0))
+                category = expense.get('category', 'Other')
+                merchant = expense.get('merchant', 'Unknown')
+                expense_date = expense.get('date') or '_unknown'
+
+                amounts.append(amount)
+                expense_count += 1
 
-            total_amount += amount
+                category_amounts[category] += amount
+                category_counts[category] += 1
 
-            by_category[category]['amount'] += amount
-            by_category[category]['count'] += 1
+                merchant_amounts[merchant] += amount
+                merchant_counts[merchant] += 1
 
-            by_merchant[merchant]['amount'] += amount
-            by_merchant[merchant]['count'] += 1
+                by_date[expense_date] += amount
 
-            if date:
-                by_date[date] += amount
+        total_amount = math.fsum(amounts)
 
-        # Get top merchants
-        top_merchants = sorted(
-            by_merchant.items(),
-            key=lambda x: x[1]['amount'],
-            reverse=True
-        )[:10]
+        # Undated expenses are bucketed under a sentinel and dropped once here
+        by_date.pop('_unknown', None)
+
+        # Merge spellings of the same merchant, labelled by the most used one
+        canonical = canonicalize([merchant for merchant, _ in merchant_counts.most_common()])
+        if len(set(canonical.values())) < len(canonical):
+            merged_amounts = Counter()
+            merged_counts = Counter()
+            for merchant, label in canonical.items():
+                merged_amounts[label] += merchant_amounts[merchant]
+                merged_counts[label] += merchant_counts[merchant]
+            merchant_amounts, merchant_counts = merged_amounts, merged_counts
+
+        by_category = {
+            category: {'amount': amount, 'count': category_counts[category]}
+            for category, amount in category_amounts.items()
+        }
+
+        # Get top merchants (same order as a full descending sort, ties included)
+        top_merchants = [
+            (merchant, {'amount': amount, 'count': merchant_counts[merchant]})
+            for merchant, amount in heapq.nlargest(
+                10,
+                merchant_amounts.items(),
+                key=itemgetter(1)
+            )
+        ]
 
         # Calculate average daily spending
         date_range_days = (
-            datetime.strptime(end_date, '%Y-%m-%d') -
-            datetime.strptime(start_date, '%Y-%m-%d')
+            date.fromisoformat(end_date) - date.fromisoformat(start_date)
         ).days + 1
 
         average_daily = total_amount / date_range_days if date_range_days > 0 else 0.0
 
-        # Get user info
-        user = self.users_table.get_item({'user_id': user_id}) or {}
+        # Get user info, unless the caller already has it
+        if user is None:
+            user = self.users_table.get_item(
+                {'user_id': user_id},
+                projection_expression='email, #name',
+                expression_names={'#name': 'name'}
+            ) or {}
 
         # Build report
         report = {
@@ -150,15 +359,11 @@ class ReportGenerator:
             'start_date': start_date,
             'end_date': end_date,
             'generated_at': datetime.utcnow().isoformat(),
-            'user': {
-                'user_id': user_id,
-                'email': user.get('email', ''),
-                'name': user.get('name', '')
-            },
+            'user': _user_summary(user_id, user),
             'summary': {
                 'total_amount': round(total_amount, 2),
-                'expense_count': len(expenses),
-                'average_expense': round(total_amount / len(expenses), 2) if expenses else 0.0,
+                'expense_count': expense_count,
+                'average_expense': round(total_amount / expense_count, 2) if expense_count else 0.0,
                 'average_daily': round(average_daily, 2),
                 'date_range_days': date_range_days
             },
@@ -179,29 +384,69 @@ class ReportGenerator:
                 for merchant, data in top_merchants
             ],
             'daily_spending': {
-                date: round(amount, 2)
-                for date, amount in sorted(by_date.items())
+                day: round(amount, 2)
+                for day, amount in sorted(by_date.items())
             }
         }
 
         return report
 
-    def export_to_csv(self, user_id: str, start_date: str, end_date: str) -> str:
+    def _iter_report_pages(
+        self,
+        user_id: str,
+        start_date: str,
+        end_date: str
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Export expenses to CSV format.
+        Yield pages of report expenses for a date range.
+
+        With REPORT_QUERY_SHARDS above 1 the range is split into day
+        sub-ranges that are queried concurrently. Pages then arrive in no
+        particular order.
 
         Args:
             user_id: User ID
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
 
-        Returns:
-            CSV content as string
+        Yields:
+            Lists of expenses, one per query page
         """
-        from boto3.dynamodb.conditions import Key
+        date_ranges = _split_date_range(start_date, end_date, REPORT_QUERY_SHARDS)
+        if len(date_ranges) == 1:
+            yield from self._query_report_pages(user_id, start_date, end_date)
+            return
+
+        with ThreadPoolExecutor(max_workers=len(date_ranges)) as pool:
+            futures = [
+                pool.submit(lambda r: list(self._query_report_pages(user_id, *r)), date_range)
+                for date_range in date_ranges
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def _query_report_pages(
+        self,
+        user_id: str,
+        start_date: str,
+        end_date: str,
+        projection_expression: str = REPORT_PROJECTION,
+        expression_names: Optional[Dict[str, str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of expenses from one serial query, in date order.
+
+        Args:
+            user_id: User ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            projection_expression: Attributes to fetch (report fields by default)
+            expression_names: Names for the projection's placeholders
+                (DATE_ATTRIBUTE_NAMES by default)
 
-        # Fetch expenses for date range
-        expenses = []
+        Yields:
+            Lists of expenses, one per query page
+        """
         last_key = None
 
         while True:
@@ -209,53 +454,86 @@ class ReportGenerator:
                 key_condition_expression=Key('user_id').eq(user_id) & Key('date').between(start_date, end_date),
                 index_name='user-date-index',
                 limit=100,
-                exclusive_start_key=last_key
+                exclusive_start_key=last_key,
+                projection_expression=projection_expression,
+                expression_names=expression_names or DATE_ATTRIBUTE_NAMES
             )
 
-            expenses.extend(result['items'])
-            last_key = result.get('last_evaluated_key')
+            yield result['items']
 
+            last_key = result.get('last_evaluated_key')
             if not last_key:
-                break
+                return
+
+    def export_to_csv(self, user_id: str, start_date: str, end_date: str) -> str:
+        """
+        Export expenses to CSV format.
 
-        # Create CSV
+        Args:
+            user_id: User ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+
+        Returns:
+            CSV content as string
+        """
         output = StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow([
-            'Date',
-            'Merchant',
-            'Category',
-            'Amount',
-            'Items',
-            'Receipt ID',
-            'Created At'
-        ])
-
-        # Write expenses
-        for expense in sorted(expenses, key=lambda x: x.get('date', '')):
-            items_str = '; '.join([
-                item.get('description', '')
-                for item in expense.get('items', [])
-                if item
-            ])
-
-            writer.writerow([
-                expense.get('date', ''),
-                expense.get('merchant', ''),
-                expense.get('category', ''),
-                f"${expense.get('amount', 0):.2f}",
-                items_str,
-                expense.get('receipt_id', ''),
-                expense.get('created_at', '')
-            ])
+        self.write_csv(user_id, start_date, end_date, output)
 
         csv_content = output.getvalue()
         output.close()
 
         return csv_content
 
+    def write_csv(self, user_id: str, start_date: str, end_date: str, stream: TextIO) -> int:
+        """
+        Write expenses as CSV to a text stream, one query page at a time.
+
+        Rows are written as each page arrives, so neither the full list of
+        expenses nor the full CSV has to be held in memory.
+
+        Args:
+            user_id: User ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            stream: Writable text stream (opened with newline='' if a file)
+
+        Returns:
+            Number of expense rows written
+        """
+        writer = csv.writer(stream)
+        writer.writerow(EXPORT_HEADER)
+
+        row_count = 0
+
+        # A single serial query keeps the rows in date order
+        for items in self._query_report_pages(
+            user_id, start_date, end_date,
+            projection_expression=EXPORT_PROJECTION,
+            expression_names=EXPORT_ATTRIBUTE_NAMES
+        ):
+            writer.writerows(self._csv_row(expense) for expense in items)
+            row_count += len(items)
+
+        return row_count
+
+    @staticmethod
+    def _csv_row(expense: Dict[str, Any]) -> tuple:
+        """Build the CSV export row for an expense."""
+        return (
+            expense.get('date', ''),
+            expense.get('merchant', ''),
+            expense.get('category', ''),
+            f"${expense.get('amount', 0):.2f}",
+            '; '.join(
+                item.get('description', '')
+                for item in expense.get('items', ())
+                if item
+            ),
+            expense.get('receipt_id', ''),
+            expense.get('created_at', '')
+        )
+
     def format_report_html(self, report: Dict[str, Any]) -> str:
         """
         Format report as HTML for email.
@@ -266,104 +544,72 @@ class ReportGenerator:
         Returns:
             HTML content
         """
-        report_type = report['report_type'].capitalize()
-        total_amount = report['summary']['total_amount']
-        expense_count = report['summary']['expense_count']
-        average_expense = report['summary']['average_expense']
-
-        # Build category rows
-        category_rows = ''
-        for category, data in sorted(
-            report['by_category'].items(),
-            key=lambda x: x[1]['amount'],
-            reverse=True
-        ):
-            category_rows += f"""
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0;">{category}</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">${data['amount']:.2f}</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">{data['count']}</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">{data['percentage']:.1f}%</td>
-                </tr>
-            """
-
-        # Build merchant rows
-        merchant_rows = ''
-        for merchant_data in report['top_merchants'][:5]:
-            merchant_rows += f"""
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0;">{merchant_data['name']}</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">${merchant_data['amount']:.2f}</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0; text-align: right;">{merchant_data['count']}</td>
-                </tr>
-            """
-
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{report_type} Expense Report</title>
-        </head>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; padding: 20px;">
-            <div style="background-color: #4CAF50; color: white; padding: 20px; text-align: center; border-radius: 8px 8px 0 0;">
-                <h1 style="margin: 0;">{report_type} Expense Report</h1>
-                <p style="margin: 10px 0 0 0;">{report['start_date']} to {report['end_date']}</p>
-            </div>
-
-            <div style="background-color: #f9f9f9; padding: 20px; border: 1px solid #e0e0e0;">
-                <h2 style="color: #4CAF50; margin-top: 0;">Summary</h2>
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px;">
-                    <div style="background-color: white; padding: 15px; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                        <h3 style="margin: 0 0 10px 0; color: #666; font-size: 14px;">Total Expenses</h3>
-                        <p style="margin: 0; font-size: 28px; font-weight: bold; color: #4CAF50;">${total_amount:.2f}</p>
-                    </div>
-                    <div style="background-color: white; padding: 15px; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                        <h3 style="margin: 0 0 10px 0; color: #666; font-size: 14px;">Number of Expenses</h3>
-                        <p style="margin: 0; font-size: 28px; font-weight: bold; color: #2196F3;">{expense_count}</p>
-                    </div>
-                </div>
-            </div>
+        summary = report['summary']
+
+        # Names come from receipts, so they are escaped before reaching the markup
+        category_rows = ''.join(
+            CATEGORY_ROW_TEMPLATE.format(name=html.escape(category), **data)
+            for category, data in sorted(
+                report['by_category'].items(),
+                key=lambda x: x[1]['amount'],
+                reverse=True
+            )
+        )
 
-            <div style="background-color: white; padding: 20px; border: 1px solid #e0e0e0; border-top: none;">
-                <h2 style="color: #4CAF50;">Expenses by Category</h2>
-                <table style="width: 100%; border-collapse: collapse;">
-                    <thead>
-                        <tr style="background-color: #f5f5f5;">
-                            <th style="padding: 10px; text-align: left; border-bottom: 2px solid #4CAF50;">Category</th>
-                            <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Amount</th>
-                            <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Count</th>
-                            <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Percentage</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {category_rows}
-                    </tbody>
-                </table>
-            </div>
+        merchant_rows = ''.join(
+            MERCHANT_ROW_TEMPLATE.format(
+                name=html.escape(merchant_data['name']),
+                amount=merchant_data['amount'],
+                count=merchant_data['count']
+            )
+            for merchant_data in report['top_merchants'][:5]
+        )
 
-            <div style="background-color: white; padding: 20px; border: 1px solid #e0e0e0; border-top: none;">
-                <h2 style="color: #4CAF50;">Top Merchants</h2>
-                <table style="width: 100%; border-collapse: collapse;">
-                    <thead>
-                        <tr style="background-color: #f5f5f5;">
-                            <th style="padding: 10px; text-align: left; border-bottom: 2px solid #4CAF50;">Merchant</th>
-                            <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Amount</th>
-                            <th style="padding: 10px; text-align: right; border-bottom: 2px solid #4CAF50;">Transactions</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {merchant_rows}
-                    </tbody>
-                </table>
-            </div>
+        return REPORT_HTML_TEMPLATE.format(
+            report_type=report['report_type'].capitalize(),
+            start_date=report['start_date'],
+            end_date=report['end_date'],
+            total_amount=summary['total_amount'],
+            expense_count=summary['expense_count'],
+            category_rows=category_rows,
+            merchant_rows=merchant_rows,
+            generated_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        )
 
-            <div style="background-color: #f9f9f9; padding: 20px; border: 1px solid #e0e0e0; border-top: none; border-radius: 0 0 8px 8px; text-align: center; color: #666; font-size: 12px;">
-                <p>Report generated on {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC</p>
-                <p>Smart Expense Tracker - Your Personal Finance Assistant</p>
-            </div>
-        </body>
-        </html>
-        """
 
-        return html
+def _user_summary(user_id: str, user: Dict[str, Any]) -> Dict[str, str]:
+    """Build a report's user block from the user record."""
+    return {
+        'user_id': user_id,
+        'email': user.get('email', ''),
+        'name': user.get('name', '')
+    }
+
+
+def _split_date_range(start_date: str, end_date: str, shards: int) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive date range into at most `shards` contiguous sub-ranges.
+
+    Args:
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+        shards: Requested number of sub-ranges
+
+    Returns:
+        (start, end) date pairs covering the range in order
+    """
+    start = date.fromisoformat(start_date)
+    days = (date.fromisoformat(end_date) - start).days + 1
+    shards = max(1, min(shards, days))
+    if shards == 1:
+        return [(start_date, end_date)]
+
+    size, extra = divmod(days, shards)
+    ranges = []
+    for shard in range(shards):
+        length = size + (1 if shard < extra else 0)
+        end = start + timedelta(days=length - 1)
+        ranges.append((start.isoformat(), end.isoformat()))
+        start = end + timedelta(days=1)
+
+    return ranges
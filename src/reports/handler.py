@@ -3,17 +3,18 @@
 import json
 import os
 import logging
-from typing import Dict, Any
-import sys
+import time
+from typing import Dict, Any, Optional, Tuple
 import base64
+import gzip
+import io
 
-# Add parent directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-from shared.response import success_response, error_response, validation_error_response
+from shared.response import (
+    success_response, error_response, validation_error_response, from_json, get_header, parse_header_item
+)
 from shared.validators import validate_required_fields
-from shared.exceptions import ExpenseTrackerException
-from shared.dynamodb import DynamoDBClient
+from shared.exceptions import ExpenseTrackerException, ThrottleError
+from shared.clients import get_table
 from reports.generator import ReportGenerator
 from reports.email_service import EmailService
 
@@ -24,7 +25,19 @@ logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 # Initialize services
 report_generator = ReportGenerator()
 email_service = EmailService()
-users_table = DynamoDBClient(os.environ.get('USERS_TABLE'))
+users_table = get_table(os.environ.get('USERS_TABLE'))
+
+# Static headers for CSV exports (Content-Disposition and, for gzip
+# bodies, Content-Encoding are added per request)
+EXPORT_HEADERS = {
+    'Content-Type': 'text/csv',
+    'Vary': 'Accept, Accept-Encoding',
+    'Access-Control-Allow-Origin': '*'
+}
+
+# Users cached across warm invocations (seconds, 0 disables)
+USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', '300'))
+_USER_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -46,7 +59,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     try:
         # Log request
-        logger.info(f"Request: {event.get('httpMethod')} {event.get('path')}")
+        logger.info("Request: %s %s", event.get('httpMethod'), event.get('path'))
 
         # Get user ID from Cognito authorizer
         user_id = get_user_id(event)
@@ -58,22 +71,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         path = event.get('path')
 
         # Route request
-        if path == '/reports/weekly' and http_method == 'GET':
-            return handle_weekly_report(event, user_id)
-        elif path == '/reports/monthly' and http_method == 'GET':
-            return handle_monthly_report(event, user_id)
-        elif path == '/reports/email' and http_method == 'POST':
-            return handle_email_report(event, user_id)
-        elif path == '/reports/export' and http_method == 'GET':
-            return handle_export(event, user_id)
-        else:
+        handler = _ROUTES.get((http_method, path))
+        if not handler:
             return error_response("Route not found", status_code=404)
 
+        return handler(event, user_id)
+
     except ExpenseTrackerException as e:
-        logger.error(f"Application error: {str(e)}")
+        logger.error("Application error: %s", e)
         return error_response(e.message, status_code=e.status_code)
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         return error_response("Internal server error", status_code=500)
 
 
@@ -89,15 +97,17 @@ def handle_weekly_report(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         API Gateway response
     """
     try:
-        logger.info(f"Generating weekly report for user {user_id}")
+        logger.info("Generating weekly report for user %s", user_id)
 
         # Generate report
         report = report_generator.generate_weekly_report(user_id)
 
-        return success_response(data=report)
+        return success_response(data=report, accept=_get_accept(event))
 
+    except ThrottleError as e:
+        return error_response(e.message, status_code=e.status_code)
     except Exception as e:
-        logger.error(f"Weekly report error: {str(e)}")
+        logger.error("Weekly report error: %s", e)
         return error_response(str(e), status_code=400)
 
 
@@ -113,15 +123,17 @@ def handle_monthly_report(event: Dict[str, Any], user_id: str) -> Dict[str, Any]
         API Gateway response
     """
     try:
-        logger.info(f"Generating monthly report for user {user_id}")
+        logger.info("Generating monthly report for user %s", user_id)
 
         # Generate report
         report = report_generator.generate_monthly_report(user_id)
 
-        return success_response(data=report)
+        return success_response(data=report, accept=_get_accept(event))
 
+    except ThrottleError as e:
+        return error_response(e.message, status_code=e.status_code)
     except Exception as e:
-        logger.error(f"Monthly report error: {str(e)}")
+        logger.error("Monthly report error: %s", e)
         return error_response(str(e), status_code=400)
 
 
@@ -137,8 +149,12 @@ def handle_email_report(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         API Gateway response
     """
     try:
-        # Parse request body
-        body = json.loads(event.get('body', '{}'))
+        # Parse request body (skipping the parser when there is none)
+        raw_body = event.get('body')
+        try:
+            body = from_json(raw_body) if raw_body else {}
+        except json.JSONDecodeError:
+            return validation_error_response("Invalid JSON in request body")
 
         # Validate required fields
         validate_required_fields(body, ['report_type'])
@@ -148,8 +164,8 @@ def handle_email_report(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         if report_type not in ['weekly', 'monthly']:
             return validation_error_response("Report type must be 'weekly' or 'monthly'")
 
-        # Get user info
-        user = users_table.get_item({'user_id': user_id})
+        # Get user info (passed on, so the report doesn't read it again)
+        user = _get_user_cached(user_id)
         if not user:
             return error_response("User not found", status_code=404)
 
@@ -159,9 +175,9 @@ def handle_email_report(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
 
         # Generate report
         if report_type == 'weekly':
-            report = report_generator.generate_weekly_report(user_id)
+            report = report_generator.generate_weekly_report(user_id, user=user)
         else:
-            report = report_generator.generate_monthly_report(user_id)
+            report = report_generator.generate_monthly_report(user_id, user=user)
 
         # Format as HTML
         html_content = report_generator.format_report_html(report)
@@ -173,7 +189,7 @@ def handle_email_report(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
             html_content=html_content
         )
 
-        logger.info(f"Report email sent to {user_email}")
+        logger.info("Report email sent to %s", user_email)
 
         return success_response(
             data={
@@ -184,8 +200,10 @@ def handle_email_report(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
             message=f"{report_type.capitalize()} report sent to {user_email}"
         )
 
+    except ThrottleError as e:
+        return error_response(e.message, status_code=e.status_code)
     except Exception as e:
-        logger.error(f"Email report error: {str(e)}")
+        logger.error("Email report error: %s", e)
         return error_response(str(e), status_code=400)
 
 
@@ -209,27 +227,102 @@ def handle_export(event: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         if not start_date or not end_date:
             return validation_error_response("start_date and end_date are required")
 
-        logger.info(f"Exporting expenses for user {user_id} from {start_date} to {end_date}")
+        logger.info("Exporting expenses for user %s from %s to %s", user_id, start_date, end_date)
 
-        # Generate CSV
-        csv_content = report_generator.export_to_csv(user_id, start_date, end_date)
+        headers = {
+            **EXPORT_HEADERS,
+            'Content-Disposition': f'attachment; filename="expenses_{start_date}_{end_date}.csv"'
+        }
+
+        if not _accepts_gzip_csv(event):
+            # Return CSV as downloadable file
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': report_generator.export_to_csv(user_id, start_date, end_date)
+            }
+
+        # Write the CSV straight into a gzip stream to stay well inside the
+        # 6MB Lambda response limit. Exports that outgrow this should be
+        # written to S3 and returned as a presigned URL instead.
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6) as gz:
+            with io.TextIOWrapper(gz, encoding='utf-8', newline='') as text:
+                report_generator.write_csv(user_id, start_date, end_date, text)
 
-        # Return CSV as downloadable file
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'text/csv',
-                'Content-Disposition': f'attachment; filename="expenses_{start_date}_{end_date}.csv"',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': csv_content
+            'headers': {**headers, 'Content-Encoding': 'gzip'},
+            'body': base64.b64encode(buffer.getvalue()).decode('ascii'),
+            'isBase64Encoded': True
         }
 
+    except ThrottleError as e:
+        return error_response(e.message, status_code=e.status_code)
     except Exception as e:
-        logger.error(f"Export error: {str(e)}")
+        logger.error("Export error: %s", e)
         return error_response(str(e), status_code=400)
 
 
+# Route table: (HTTP method, path) -> handler
+_ROUTES = {
+    ('GET', '/reports/weekly'): handle_weekly_report,
+    ('GET', '/reports/monthly'): handle_monthly_report,
+    ('POST', '/reports/email'): handle_email_report,
+    ('GET', '/reports/export'): handle_export
+}
+
+
+def _get_accept(event: Dict[str, Any]) -> str:
+    """Return the request's Accept header ('' when absent), whatever its casing."""
+    return get_header(event, 'Accept', '')
+
+
+def _accepts_gzip_csv(event: Dict[str, Any]) -> bool:
+    """
+    Return whether the export can be sent as a gzip body.
+
+    The request's Accept-Encoding must allow gzip, and its first Accept
+    media type must be text/csv: API Gateway only decodes the base64 body
+    when that type is one of its binary media types.
+    """
+    media_type, quality = parse_header_item(_get_accept(event).split(',', 1)[0])
+    if media_type != 'text/csv' or quality <= 0:
+        return False
+
+    for coding in get_header(event, 'Accept-Encoding', '').split(','):
+        name, quality = parse_header_item(coding)
+        if name == 'gzip':
+            # An explicit q=0 refuses the coding
+            return quality > 0
+    return False
+
+
+def _get_user_cached(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a user's email and name, reusing a cached lookup while it is fresh.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Dictionary with the user's email and name, or None if the user doesn't exist
+    """
+    cached = _USER_CACHE.get(user_id)
+    if cached and time.monotonic() - cached[0] < USER_CACHE_TTL:
+        return cached[1]
+
+    user = users_table.get_item(
+        {'user_id': user_id},
+        projection_expression='email, #name',
+        expression_names={'#name': 'name'}
+    )
+    if user and user.get('email') and USER_CACHE_TTL > 0:
+        _USER_CACHE[user_id] = (time.monotonic(), user)
+
+    return user
+
+
 def get_user_id(event: Dict[str, Any]) -> str:
     """
     Extract user ID from Cognito authorizer claims.
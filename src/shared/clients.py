@@ -0,0 +1,24 @@
+"""Shared AWS client instances."""
+
+from functools import lru_cache
+
+from .dynamodb import DynamoDBClient
+
+
+@lru_cache(maxsize=None)
+def get_table(table_name: str) -> DynamoDBClient:
+    """
+    Get the shared DynamoDB client for a table.
+
+    Returns the same DynamoDBClient for every caller in the process, so
+    handlers and services that use the same table share one wrapper and
+    one connection pool across warm invocations. Look table names up once
+    per module (at import or in __init__), not per request.
+
+    Args:
+        table_name: Name of the DynamoDB table
+
+    Returns:
+        DynamoDB client for the table
+    """
+    return DynamoDBClient(table_name)
@@ -1,17 +1,191 @@
 """DynamoDB utilities and helper functions."""
 
 import os
+import time
 import boto3
 from typing import Any, Dict, List, Optional
 from decimal import Decimal
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from .exceptions import DatabaseError, NotFoundError
+from .exceptions import DatabaseError, NotFoundError, ThrottleError
 
 logger = logging.getLogger(__name__)
 
+# Shared connection settings for all DynamoDB tables in the process
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'standard'}
+)
+
+# BatchGetItem / BatchWriteItem request size limits
+BATCH_GET_SIZE = 100
+BATCH_WRITE_SIZE = 25
+
+# Batch writes of at least this many items are sent from a thread pool
+PARALLEL_WRITE_MIN_ITEMS = 50
+PARALLEL_WRITE_WORKERS = 8
+
+# Retries for unprocessed batch keys (exponential backoff from 50ms)
+BATCH_MAX_RETRIES = 5
+BATCH_RETRY_BASE_DELAY = 0.05
+
+# Error codes DynamoDB returns when a request is throttled
+THROTTLING_ERROR_CODES = frozenset({
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+})
+
+# DynamoDB resources by endpoint URL, reused across clients and warm invocations
+_RESOURCE_CACHE: Dict[Optional[str], Any] = {}
+_DAX_RESOURCE_CACHE: Dict[str, Any] = {}
+
+
+def _get_resource(endpoint_url: Optional[str] = None) -> Any:
+    """
+    Get the shared DynamoDB resource for an endpoint.
+
+    Args:
+        endpoint_url: Optional endpoint URL (e.g. LocalStack)
+
+    Returns:
+        boto3 DynamoDB service resource
+    """
+    resource = _RESOURCE_CACHE.get(endpoint_url)
+    if resource is None:
+        resource = boto3.resource('dynamodb', endpoint_url=endpoint_url, config=CLIENT_CONFIG)
+        _RESOURCE_CACHE[endpoint_url] = resource
+    return resource
+
+
+def _get_dax_resource(endpoint_url: str) -> Any:
+    """
+    Get the shared DAX resource for a cluster endpoint.
+
+    The DAX resource exposes the same Table API as boto3; reads are
+    served from the cluster cache and writes go through to DynamoDB.
+
+    Args:
+        endpoint_url: DAX cluster endpoint (e.g. dax://my-cluster...)
+
+    Returns:
+        DAX service resource
+    """
+    resource = _DAX_RESOURCE_CACHE.get(endpoint_url)
+    if resource is None:
+        from amazondax import AmazonDaxClient
+
+        resource = AmazonDaxClient.resource(endpoint_url=endpoint_url)
+        _DAX_RESOURCE_CACHE[endpoint_url] = resource
+    return resource
+
+
+def _database_error(operation: str, error: ClientError) -> Exception:
+    """
+    Map a botocore ClientError to the application exception to raise.
+
+    Args:
+        operation: Description of the failed operation (e.g. "put item")
+        error: Original ClientError
+
+    Returns:
+        ThrottleError for throttled requests, DatabaseError otherwise
+    """
+    if error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES:
+        return ThrottleError()
+    return DatabaseError(f"Failed to {operation}")
+
+
+def _batch_request(call: Any, request_items: Dict[str, Any], unprocessed_field: str) -> List[Dict[str, Any]]:
+    """
+    Send a batch request, retrying unprocessed entries with exponential backoff.
+
+    Args:
+        call: Batch operation (batch_get_item or batch_write_item)
+        request_items: RequestItems for the first attempt
+        unprocessed_field: Response field holding unprocessed entries
+
+    Returns:
+        Responses from every attempt
+
+    Raises:
+        DatabaseError: If entries are still unprocessed after all retries
+    """
+    responses = []
+
+    for attempt in range(BATCH_MAX_RETRIES + 1):
+        response = call(RequestItems=request_items)
+        responses.append(response)
+
+        request_items = response.get(unprocessed_field)
+        if not request_items:
+            return responses
+        if attempt < BATCH_MAX_RETRIES:
+            time.sleep(BATCH_RETRY_BASE_DELAY * (2 ** attempt))
+
+    raise DatabaseError(f"Batch request left {unprocessed_field} after {BATCH_MAX_RETRIES} retries")
+
+
+def _decimal_to_number(value: Decimal) -> Any:
+    """Convert a DynamoDB number to int when it has no fractional digits, float otherwise."""
+    # A non-negative exponent means no digits after the decimal point
+    if value.as_tuple().exponent >= 0:
+        return int(value)
+    return float(value)
+
+
+# Scalar converters dispatched on exact type; other values pass through
+_TO_DYNAMODB = {float: lambda value: Decimal(str(value))}
+_FROM_DYNAMODB = {Decimal: _decimal_to_number}
+
+
+def _convert(obj: Any, converters: Dict[type, Any], copy: bool) -> Any:
+    """
+    Convert scalar leaves of a nested dict/list structure.
+
+    Walks the structure with an explicit stack instead of recursing, and
+    looks up scalar converters by type.
+
+    Args:
+        obj: Value to convert
+        converters: Mapping of scalar type to converter function
+        copy: Whether to convert into copies instead of mutating containers
+
+    Returns:
+        Converted value
+    """
+    if not isinstance(obj, (dict, list)):
+        convert = converters.get(type(obj))
+        return convert(obj) if convert else obj
+
+    root = (dict(obj) if isinstance(obj, dict) else list(obj)) if copy else obj
+    stack = [root]
+
+    while stack:
+        container = stack.pop()
+        entries = container.items() if isinstance(container, dict) else enumerate(container)
+
+        for key, value in entries:
+            if isinstance(value, dict):
+                if copy:
+                    value = container[key] = dict(value)
+                stack.append(value)
+            elif isinstance(value, list):
+                if copy:
+                    value = container[key] = list(value)
+                stack.append(value)
+            else:
+                convert = converters.get(type(value))
+                if convert:
+                    container[key] = convert(value)
+
+    return root
+
 
 class DynamoDBClient:
     """DynamoDB client wrapper with common operations."""
@@ -25,12 +199,15 @@ class DynamoDBClient:
         """
         self.table_name = table_name
 
-        # Support for LocalStack
+        # Support for LocalStack, and DAX when a cluster endpoint is configured
         endpoint_url = os.environ.get('LOCALSTACK_ENDPOINT')
+        dax_endpoint = os.environ.get('DAX_ENDPOINT')
         if endpoint_url and os.environ.get('USE_LOCALSTACK', 'false').lower() == 'true':
-            self.dynamodb = boto3.resource('dynamodb', endpoint_url=endpoint_url)
+            self.dynamodb = _get_resource(endpoint_url)
+        elif dax_endpoint:
+            self.dynamodb = _get_dax_resource(dax_endpoint)
         else:
-            self.dynamodb = boto3.resource('dynamodb')
+            self.dynamodb = _get_resource()
 
         self.table = self.dynamodb.Table(table_name)
 
@@ -53,15 +230,22 @@ class DynamoDBClient:
             self.table.put_item(Item=item)
             return item
         except ClientError as e:
-            logger.error(f"Error putting item: {e}")
-            raise DatabaseError(f"Failed to put item: {str(e)}")
+            logger.error("Error putting item: %s", e)
+            raise _database_error("put item", e) from e
 
-    def get_item(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def get_item(
+        self,
+        key: Dict[str, Any],
+        projection_expression: Optional[str] = None,
+        expression_names: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get an item from the table.
 
         Args:
             key: Primary key of the item
+            projection_expression: Optional attributes to return
+            expression_names: Optional expression attribute names
 
         Returns:
             The item if found, None otherwise
@@ -70,14 +254,21 @@ class DynamoDBClient:
             DatabaseError: If the operation fails
         """
         try:
-            response = self.table.get_item(Key=key)
+            kwargs = {'Key': key}
+
+            if projection_expression:
+                kwargs['ProjectionExpression'] = projection_expression
+            if expression_names:
+                kwargs['ExpressionAttributeNames'] = expression_names
+
+            response = self.table.get_item(**kwargs)
             item = response.get('Item')
             if item:
                 return self._dynamodb_to_python(item)
             return None
         except ClientError as e:
-            logger.error(f"Error getting item: {e}")
-            raise DatabaseError(f"Failed to get item: {str(e)}")
+            logger.error("Error getting item: %s", e)
+            raise _database_error("get item", e) from e
 
     def update_item(
         self,
@@ -117,8 +308,8 @@ class DynamoDBClient:
             response = self.table.update_item(**kwargs)
             return self._dynamodb_to_python(response['Attributes'])
         except ClientError as e:
-            logger.error(f"Error updating item: {e}")
-            raise DatabaseError(f"Failed to update item: {str(e)}")
+            logger.error("Error updating item: %s", e)
+            raise _database_error("update item", e) from e
 
     def delete_item(self, key: Dict[str, Any]) -> None:
         """
@@ -133,8 +324,8 @@ class DynamoDBClient:
         try:
             self.table.delete_item(Key=key)
         except ClientError as e:
-            logger.error(f"Error deleting item: {e}")
-            raise DatabaseError(f"Failed to delete item: {str(e)}")
+            logger.error("Error deleting item: %s", e)
+            raise _database_error("delete item", e) from e
 
     def query(
         self,
@@ -143,7 +334,9 @@ class DynamoDBClient:
         index_name: Optional[str] = None,
         limit: Optional[int] = None,
         scan_forward: bool = True,
-        exclusive_start_key: Optional[Dict[str, Any]] = None
+        exclusive_start_key: Optional[Dict[str, Any]] = None,
+        projection_expression: Optional[str] = None,
+        expression_names: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """
         Query items from the table.
@@ -155,6 +348,8 @@ class DynamoDBClient:
             limit: Optional limit
             scan_forward: Sort order (default: True for ascending)
             exclusive_start_key: Optional pagination key
+            projection_expression: Optional attributes to return
+            expression_names: Optional expression attribute names
 
         Returns:
             Dictionary with items and optional LastEvaluatedKey
@@ -176,6 +371,10 @@ class DynamoDBClient:
                 kwargs['Limit'] = limit
             if exclusive_start_key:
                 kwargs['ExclusiveStartKey'] = exclusive_start_key
+            if projection_expression:
+                kwargs['ProjectionExpression'] = projection_expression
+            if expression_names:
+                kwargs['ExpressionAttributeNames'] = expression_names
 
             response = self.table.query(**kwargs)
 
@@ -184,8 +383,8 @@ class DynamoDBClient:
                 'last_evaluated_key': response.get('LastEvaluatedKey')
             }
         except ClientError as e:
-            logger.error(f"Error querying items: {e}")
-            raise DatabaseError(f"Failed to query items: {str(e)}")
+            logger.error("Error querying items: %s", e)
+            raise _database_error("query items", e) from e
 
     def scan(
         self,
@@ -224,13 +423,52 @@ class DynamoDBClient:
                 'last_evaluated_key': response.get('LastEvaluatedKey')
             }
         except ClientError as e:
-            logger.error(f"Error scanning items: {e}")
-            raise DatabaseError(f"Failed to scan items: {str(e)}")
+            logger.error("Error scanning items: %s", e)
+            raise _database_error("scan items", e) from e
+
+    def batch_get(self, keys: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Get multiple items from the table in batches.
+
+        Keys are sent 100 per BatchGetItem request, and unprocessed keys
+        are retried with exponential backoff. Duplicate keys are fetched
+        once. Items are returned in no particular order.
+
+        Args:
+            keys: Primary keys of the items
+
+        Returns:
+            List of items found
+
+        Raises:
+            DatabaseError: If the operation fails
+        """
+        unique_keys = list({tuple(sorted(key.items())): key for key in keys}.values())
+        items = []
+
+        try:
+            for start in range(0, len(unique_keys), BATCH_GET_SIZE):
+                responses = _batch_request(
+                    self.dynamodb.batch_get_item,
+                    {self.table_name: {'Keys': unique_keys[start:start + BATCH_GET_SIZE]}},
+                    'UnprocessedKeys'
+                )
+                for response in responses:
+                    items.extend(response.get('Responses', {}).get(self.table_name, []))
+
+            return [self._dynamodb_to_python(item) for item in items]
+        except ClientError as e:
+            logger.error("Error batch getting items: %s", e)
+            raise _database_error("batch get items", e) from e
 
     def batch_write(self, items: List[Dict[str, Any]]) -> None:
         """
         Batch write items to the table.
 
+        Small writes use the table's batch writer. Larger writes are split
+        into 25-item BatchWriteItem requests sent concurrently, each
+        retrying its unprocessed items with exponential backoff.
+
         Args:
             items: List of items to write
 
@@ -238,33 +476,39 @@ class DynamoDBClient:
             DatabaseError: If the operation fails
         """
         try:
-            with self.table.batch_writer() as batch:
-                for item in items:
-                    batch.put_item(Item=self._python_to_dynamodb(item))
+            if len(items) < PARALLEL_WRITE_MIN_ITEMS:
+                with self.table.batch_writer() as batch:
+                    for item in items:
+                        batch.put_item(Item=self._python_to_dynamodb(item))
+                return
+
+            requests = [{'PutRequest': {'Item': self._python_to_dynamodb(item)}} for item in items]
+            chunks = [
+                requests[start:start + BATCH_WRITE_SIZE]
+                for start in range(0, len(requests), BATCH_WRITE_SIZE)
+            ]
+
+            # The low-level client is thread-safe, unlike the resource
+            client = self.dynamodb.meta.client
+
+            def write_chunk(chunk: List[Dict[str, Any]]) -> None:
+                _batch_request(client.batch_write_item, {self.table_name: chunk}, 'UnprocessedItems')
+
+            with ThreadPoolExecutor(max_workers=min(PARALLEL_WRITE_WORKERS, len(chunks))) as pool:
+                list(pool.map(write_chunk, chunks))
         except ClientError as e:
-            logger.error(f"Error batch writing items: {e}")
-            raise DatabaseError(f"Failed to batch write items: {str(e)}")
+            logger.error("Error batch writing items: %s", e)
+            raise _database_error("batch write items", e) from e
 
     @staticmethod
     def _python_to_dynamodb(obj: Any) -> Any:
         """Convert Python objects to DynamoDB compatible format."""
-        if isinstance(obj, dict):
-            return {k: DynamoDBClient._python_to_dynamodb(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [DynamoDBClient._python_to_dynamodb(item) for item in obj]
-        elif isinstance(obj, float):
-            return Decimal(str(obj))
-        return obj
+        # Caller-owned data: convert into copies
+        return _convert(obj, _TO_DYNAMODB, copy=True)
 
     @staticmethod
     def _dynamodb_to_python(obj: Any) -> Any:
         """Convert DynamoDB objects to Python format."""
-        if isinstance(obj, dict):
-            return {k: DynamoDBClient._dynamodb_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [DynamoDBClient._dynamodb_to_python(item) for item in obj]
-        elif isinstance(obj, Decimal):
-            if obj % 1 == 0:
-                return int(obj)
-            return float(obj)
-        return obj
+        # Items come straight from a boto3 response, so convert in place
+        return _convert(obj, _FROM_DYNAMODB, copy=False)
+
@@ -1,66 +1,80 @@
 """Custom exceptions for the expense tracker application."""
 
+from typing import Optional
+
 
 class ExpenseTrackerException(Exception):
-    """Base exception for all expense tracker errors."""
+    """Base exception for all expense tracker errors.
+
+    Subclasses set ``status_code`` and ``default_message`` as class
+    attributes rather than overriding ``__init__``.
+    """
+
+    status_code = 500
+    default_message = "Internal server error"
 
-    def __init__(self, message: str, status_code: int = 500):
-        self.message = message
-        self.status_code = status_code
-        super().__init__(self.message)
+    def __init__(self, message: Optional[str] = None, status_code: Optional[int] = None):
+        self.message = message or self.default_message
+        if status_code is not None:
+            self.status_code = status_code
+        Exception.__init__(self, self.message)
 
 
 class ValidationError(ExpenseTrackerException):
     """Raised when input validation fails."""
 
-    def __init__(self, message: str):
-        super().__init__(message, status_code=400)
+    status_code = 400
+    default_message = "Invalid input"
 
 
 class AuthenticationError(ExpenseTrackerException):
     """Raised when authentication fails."""
 
-    def __init__(self, message: str = "Authentication failed"):
-        super().__init__(message, status_code=401)
+    status_code = 401
+    default_message = "Authentication failed"
 
 
 class AuthorizationError(ExpenseTrackerException):
     """Raised when user is not authorized."""
 
-    def __init__(self, message: str = "Not authorized"):
-        super().__init__(message, status_code=403)
+    status_code = 403
+    default_message = "Not authorized"
 
 
 class NotFoundError(ExpenseTrackerException):
     """Raised when a resource is not found."""
 
-    def __init__(self, message: str = "Resource not found"):
-        super().__init__(message, status_code=404)
+    status_code = 404
+    default_message = "Resource not found"
 
 
 class ConflictError(ExpenseTrackerException):
     """Raised when there's a conflict (e.g., duplicate resource)."""
 
-    def __init__(self, message: str = "Resource conflict"):
-        super().__init__(message, status_code=409)
+    status_code = 409
+    default_message = "Resource conflict"
 
 
 class OCRProcessingError(ExpenseTrackerException):
     """Raised when OCR processing fails."""
 
-    def __init__(self, message: str = "OCR processing failed"):
-        super().__init__(message, status_code=500)
+    default_message = "OCR processing failed"
 
 
 class StorageError(ExpenseTrackerException):
     """Raised when storage operations fail."""
 
-    def __init__(self, message: str = "Storage operation failed"):
-        super().__init__(message, status_code=500)
+    default_message = "Storage operation failed"
 
 
 class DatabaseError(ExpenseTrackerException):
     """Raised when database operations fail."""
 
-    def __init__(self, message: str = "Database operation failed"):
-        super().__init__(message, status_code=500)
+    default_message = "Database operation failed"
+
+
+class ThrottleError(ExpenseTrackerException):
+    """Raised when a request is throttled by a backing AWS service."""
+
+    status_code = 429
+    default_message = "Too many requests, please retry later"
@@ -0,0 +1,54 @@
+"""Invalidation stamps for the generated-report cache."""
+
+import os
+import uuid
+import logging
+
+from .clients import get_table
+from .exceptions import DatabaseError, ThrottleError
+
+logger = logging.getLogger(__name__)
+
+# Seconds a generated report is served from the report cache table (0 disables)
+REPORT_CACHE_TTL = int(os.environ.get('REPORT_CACHE_TTL', '3600'))
+
+# Sort key of the per-user row holding the current report version stamp
+REPORT_VERSION_KEY = 'version'
+
+
+def get_report_cache():
+    """
+    Get the report cache table, if caching is enabled.
+
+    Returns:
+        DynamoDB client for the cache table, or None when caching is off
+    """
+    table_name = os.environ.get('REPORT_CACHE_TABLE')
+    if not table_name or REPORT_CACHE_TTL <= 0:
+        return None
+    return get_table(table_name)
+
+
+def invalidate_user_reports(user_id: str) -> None:
+    """
+    Invalidate every cached report for a user.
+
+    Replaces the user's version stamp, so reports cached under the old
+    stamp are no longer served. Call this after each expense write.
+
+    Args:
+        user_id: User ID
+    """
+    report_cache = get_report_cache()
+    if not report_cache:
+        return
+
+    try:
+        report_cache.update_item(
+            {'user_id': user_id, 'report_key': REPORT_VERSION_KEY},
+            'SET stamp = :stamp',
+            {':stamp': uuid.uuid4().hex}
+        )
+    except (DatabaseError, ThrottleError) as e:
+        # Cached reports still expire after REPORT_CACHE_TTL
+        logger.warning("Report cache invalidation failed for %s: %s", user_id, e)
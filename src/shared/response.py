@@ -1,27 +1,135 @@
 """Response utilities for Lambda functions."""
 
+import base64
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime, date
 from decimal import Decimal
 
+try:
+    import orjson
+except ImportError:  # Local development without the dependencies layer
+    orjson = None
 
-class DecimalEncoder(json.JSONEncoder):
-    """JSON encoder for Decimal and datetime objects."""
+try:
+    import msgpack
+except ImportError:  # Binary responses are optional; JSON is always available
+    msgpack = None
 
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        return super().default(obj)
+MSGPACK_CONTENT_TYPE = "application/x-msgpack"
+
+# Shared by every response; only copied when extra headers are passed
+DEFAULT_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS"
+}
+
+
+def _default(obj: Any) -> Any:
+    """Serialize Decimal and datetime objects for JSON encoding."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_json(body: Any) -> str:
+    """
+    Serialize a response body to a JSON string.
+
+    Uses orjson when available and falls back to the standard library.
+
+    Args:
+        body: Response body
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(body, default=_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(body, default=_default)
+
+
+def from_json(data: str) -> Any:
+    """
+    Deserialize a JSON request body.
+
+    Uses orjson when available and falls back to the standard library.
+    Both raise json.JSONDecodeError on invalid input.
+
+    Args:
+        data: JSON string
+
+    Returns:
+        Parsed value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def get_header(event: Dict[str, Any], name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Get a request header regardless of how the client cased its name.
+
+    Args:
+        event: Lambda proxy event
+        name: Header name
+        default: Value returned when the header is absent
+
+    Returns:
+        Header value, or default
+    """
+    name = name.lower()
+    headers = event.get('headers') or {}
+    return next((value for key, value in headers.items() if key.lower() == name), default)
+
+
+def parse_header_item(item: str) -> Tuple[str, float]:
+    """
+    Split one comma-separated Accept or Accept-Encoding item into its value and q.
+
+    Args:
+        item: Item such as "gzip;q=0.5" or "application/json"
+
+    Returns:
+        Tuple of the lower-cased value and its quality (1.0 when not given,
+        0.0 when unparseable)
+    """
+    value, *params = item.split(';')
+    quality = 1.0
+    for param in params:
+        key, _, number = param.strip().partition('=')
+        if key.lower() == 'q':
+            try:
+                quality = float(number)
+            except ValueError:
+                quality = 0.0
+    return value.strip().lower(), quality
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """
+    Return True if the Accept header asks for MessagePack and it can be produced.
+
+    Only the first media type counts: API Gateway matches that one against
+    its binary media types to decide whether to decode a base64 body.
+    """
+    if msgpack is None or not accept:
+        return False
+    media_type, quality = parse_header_item(accept.split(',', 1)[0])
+    return media_type == MSGPACK_CONTENT_TYPE and quality > 0
 
 
 def success_response(
     data: Any = None,
     message: Optional[str] = None,
     status_code: int = 200,
-    headers: Optional[Dict[str, str]] = None
+    headers: Optional[Dict[str, str]] = None,
+    accept: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Create a standardized success response.
@@ -31,6 +139,10 @@ def success_response(
         message: Optional success message
         status_code: HTTP status code (default: 200)
         headers: Optional additional headers
+        accept: Accept header from the request ('' when absent) for endpoints
+            that negotiate the body format; when its first media type is
+            application/x-msgpack the body is MessagePack instead of JSON.
+            Negotiated responses send Vary: Accept.
 
     Returns:
         Lambda proxy response dictionary
@@ -43,20 +155,22 @@ def success_response(
     if message:
         body["message"] = message
 
-    default_headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
-        "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS"
-    }
+    response_headers = {**DEFAULT_HEADERS, **headers} if headers else DEFAULT_HEADERS
+    if accept is not None:
+        response_headers = {**response_headers, "Vary": "Accept"}
 
-    if headers:
-        default_headers.update(headers)
+    if accepts_msgpack(accept):
+        return {
+            "statusCode": status_code,
+            "headers": {**response_headers, "Content-Type": MSGPACK_CONTENT_TYPE},
+            "body": base64.b64encode(msgpack.packb(body, default=_default)).decode('ascii'),
+            "isBase64Encoded": True
+        }
 
     return {
         "statusCode": status_code,
-        "headers": default_headers,
-        "body": json.dumps(body, cls=DecimalEncoder)
+        "headers": response_headers,
+        "body": to_json(body)
     }
 
 
@@ -91,20 +205,12 @@ def error_response(
     if details:
         body["error"]["details"] = details
 
-    default_headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Headers": "Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token",
-        "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS"
-    }
-
-    if headers:
-        default_headers.update(headers)
+    response_headers = {**DEFAULT_HEADERS, **headers} if headers else DEFAULT_HEADERS
 
     return {
         "statusCode": status_code,
-        "headers": default_headers,
-        "body": json.dumps(body, cls=DecimalEncoder)
+        "headers": response_headers,
+        "body": to_json(body)
     }
 
 
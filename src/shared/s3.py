@@ -1,17 +1,93 @@
 """S3 utilities and helper functions."""
 
+import io
 import os
+import time
 import boto3
-from typing import Optional, Dict, Any
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from typing import Optional, Dict, Any, IO, Iterable, Iterator, Tuple, Union
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import logging
-import base64
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+try:
+    import pybase64 as base64
+except ImportError:  # Fall back to the standard library codec
+    import base64
+
 from .exceptions import StorageError
 
 logger = logging.getLogger(__name__)
 
+# Shared connection settings for all S3 clients in the process
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5}
+)
+
+# Base64 is decoded in slices of this many characters (a multiple of 4)
+BASE64_CHUNK_SIZE = 64 * 1024
+
+# Decoded uploads larger than this spill from memory to /tmp
+SPOOL_MAX_SIZE = 1024 * 1024
+
+_BASE64_WHITESPACE = b'\r\n\t '
+
+# Uploads at or above the threshold are sent as concurrent multipart parts
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# Streaming reads yield chunks of this size
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Parallel downloads fetch byte ranges of this size concurrently
+DOWNLOAD_RANGE_SIZE = 8 * 1024 * 1024
+DOWNLOAD_WORKERS = 8
+
+# DeleteObjects accepts at most this many keys per request
+DELETE_BATCH_SIZE = 1000
+
+# Seconds a HeadObject response is reused by file_exists/get_file_metadata
+HEAD_CACHE_TTL = 5.0
+
+# Presigned URLs are reused while at least this fraction of their lifetime remains
+PRESIGNED_URL_MIN_REMAINING = 0.25
+PRESIGNED_URL_CACHE_SIZE = 4096
+
+# S3 clients by endpoint URL, reused across buckets and warm invocations
+_CLIENT_CACHE: Dict[Optional[str], Any] = {}
+
+# LocalStack settings, read once at import
+_LOCALSTACK_ENDPOINT = os.environ.get('LOCALSTACK_ENDPOINT')
+_USE_LOCALSTACK = os.environ.get('USE_LOCALSTACK', 'false').lower() == 'true'
+
+
+def _get_s3_client(endpoint_url: Optional[str] = None) -> Any:
+    """
+    Get the shared S3 client for an endpoint.
+
+    Args:
+        endpoint_url: Optional endpoint URL (e.g. LocalStack)
+
+    Returns:
+        boto3 S3 client
+    """
+    client = _CLIENT_CACHE.get(endpoint_url)
+    if client is None:
+        client = boto3.client('s3', endpoint_url=endpoint_url, config=CLIENT_CONFIG)
+        _CLIENT_CACHE[endpoint_url] = client
+    return client
+
 
 class S3Client:
     """S3 client wrapper with common operations."""
@@ -26,15 +102,21 @@ class S3Client:
         self.bucket_name = bucket_name
 
         # Support for LocalStack
-        endpoint_url = os.environ.get('LOCALSTACK_ENDPOINT')
-        if endpoint_url and os.environ.get('USE_LOCALSTACK', 'false').lower() == 'true':
-            self.s3 = boto3.client('s3', endpoint_url=endpoint_url)
+        if _LOCALSTACK_ENDPOINT and _USE_LOCALSTACK:
+            self.s3 = _get_s3_client(_LOCALSTACK_ENDPOINT)
         else:
-            self.s3 = boto3.client('s3')
+            self.s3 = _get_s3_client()
+
+        # HeadObject responses by key, as (fetched_at, response)
+        self._head_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+        # Presigned URLs by (key, expiration, operation), as (url, expires_at)
+        self._url_cache: Dict[Tuple[str, int, str], Tuple[str, float]] = {}
+        self._url_cache_lock = threading.Lock()
 
     def upload_file(
         self,
-        file_content: bytes,
+        file_content: Union[bytes, IO[bytes]],
         key: str,
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, str]] = None
@@ -43,7 +125,7 @@ class S3Client:
         Upload a file to S3.
 
         Args:
-            file_content: File content as bytes
+            file_content: File content as bytes or a seekable binary file
             key: S3 object key
             content_type: Optional content type
             metadata: Optional metadata
@@ -55,23 +137,36 @@ class S3Client:
             StorageError: If the upload fails
         """
         try:
-            kwargs = {
-                'Bucket': self.bucket_name,
-                'Key': key,
-                'Body': file_content,
-                'ServerSideEncryption': 'AES256'
-            }
+            extra_args = {'ServerSideEncryption': 'AES256'}
 
             if content_type:
-                kwargs['ContentType'] = content_type
+                extra_args['ContentType'] = content_type
 
             if metadata:
-                kwargs['Metadata'] = metadata
-
-            self.s3.put_object(**kwargs)
+                extra_args['Metadata'] = metadata
+
+            if self._content_length(file_content) >= TRANSFER_CONFIG.multipart_threshold:
+                if isinstance(file_content, (bytes, bytearray)):
+                    file_content = io.BytesIO(file_content)
+                self.s3.upload_fileobj(
+                    file_content,
+                    self.bucket_name,
+                    key,
+                    ExtraArgs=extra_args,
+                    Config=TRANSFER_CONFIG
+                )
+            else:
+                self.s3.put_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Body=file_content,
+                    **extra_args
+                )
+
+            self._head_cache.pop(key, None)
             logger.info(f"Successfully uploaded file to s3://{self.bucket_name}/{key}")
             return key
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
             logger.error(f"Error uploading file to S3: {e}")
             raise StorageError(f"Failed to upload file: {str(e)}")
 
@@ -98,13 +193,56 @@ class S3Client:
             StorageError: If the upload fails
         """
         try:
-            # Decode base64 content
-            file_content = base64.b64decode(base64_content)
-            return self.upload_file(file_content, key, content_type, metadata)
+            with self._decode_base64(base64_content) as file_content:
+                return self.upload_file(file_content, key, content_type, metadata)
         except Exception as e:
             logger.error(f"Error decoding/uploading base64 file: {e}")
             raise StorageError(f"Failed to upload base64 file: {str(e)}")
 
+    @staticmethod
+    def _content_length(file_content: Union[bytes, IO[bytes]]) -> int:
+        """Return the number of bytes left to read from bytes or a seekable file."""
+        if isinstance(file_content, (bytes, bytearray)):
+            return len(file_content)
+
+        position = file_content.tell()
+        size = file_content.seek(0, io.SEEK_END) - position
+        file_content.seek(position)
+        return size
+
+    @staticmethod
+    def _decode_base64(base64_content: str) -> IO[bytes]:
+        """
+        Decode base64 content slice by slice into a spooled temporary file.
+
+        Avoids holding the encoded and decoded payloads in memory at once.
+        Whitespace is dropped and any partial quantum is carried into the
+        next slice, so slices stay aligned to 4-character boundaries; any
+        other non-alphabet character is rejected.
+
+        Args:
+            base64_content: Base64-encoded content
+
+        Returns:
+            Spooled file positioned at the start of the decoded bytes
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        carry = b''
+
+        for start in range(0, len(base64_content), BASE64_CHUNK_SIZE):
+            chunk = base64_content[start:start + BASE64_CHUNK_SIZE].encode('ascii')
+            chunk = carry + chunk.translate(None, _BASE64_WHITESPACE)
+            aligned = len(chunk) - len(chunk) % 4
+            spool.write(base64.b64decode(chunk[:aligned], validate=True))
+            carry = chunk[aligned:]
+
+        if carry:
+            # Lets b64decode raise on a truncated final quantum
+            spool.write(base64.b64decode(carry, validate=True))
+
+        spool.seek(0)
+        return spool
+
     def download_file(self, key: str) -> bytes:
         """
         Download a file from S3.
@@ -125,6 +263,82 @@ class S3Client:
             logger.error(f"Error downloading file from S3: {e}")
             raise StorageError(f"Failed to download file: {str(e)}")
 
+    def download_file_stream(
+        self,
+        key: str,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Stream a file from S3 in chunks.
+
+        Args:
+            key: S3 object key
+            chunk_size: Maximum size of each yielded chunk
+
+        Yields:
+            Consecutive chunks of the file content
+
+        Raises:
+            StorageError: If the download fails
+        """
+        try:
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            logger.error(f"Error downloading file from S3: {e}")
+            raise StorageError(f"Failed to download file: {str(e)}")
+
+        body = response['Body']
+        try:
+            yield from body.iter_chunks(chunk_size=chunk_size)
+        finally:
+            body.close()
+
+    def download_file_parallel(self, key: str) -> bytearray:
+        """
+        Download a file from S3 using concurrent byte-range requests.
+
+        Objects no larger than one range are fetched with a single request.
+        Every range is pinned to the ETag from the initial HeadObject, so an
+        object overwritten mid-download fails instead of mixing versions.
+
+        Args:
+            key: S3 object key
+
+        Returns:
+            File content
+
+        Raises:
+            StorageError: If the download fails
+        """
+        try:
+            head = self.s3.head_object(Bucket=self.bucket_name, Key=key)
+            size = head['ContentLength']
+            etag = head['ETag']
+            if size <= DOWNLOAD_RANGE_SIZE:
+                return bytearray(self.download_file(key))
+
+            buffer = bytearray(size)
+            view = memoryview(buffer)
+
+            def fetch_range(start: int) -> None:
+                end = min(start + DOWNLOAD_RANGE_SIZE, size) - 1
+                response = self.s3.get_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Range=f'bytes={start}-{end}',
+                    IfMatch=etag
+                )
+                view[start:end + 1] = response['Body'].read()
+
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+                # list() re-raises the first failed range
+                list(pool.map(fetch_range, range(0, size, DOWNLOAD_RANGE_SIZE)))
+
+            return buffer
+        except ClientError as e:
+            logger.error(f"Error downloading file from S3: {e}")
+            raise StorageError(f"Failed to download file: {str(e)}")
+
     def delete_file(self, key: str) -> None:
         """
         Delete a file from S3.
@@ -135,13 +349,48 @@ class S3Client:
         Raises:
             StorageError: If the deletion fails
         """
+        self.delete_files([key])
+
+    def delete_files(self, keys: Iterable[str]) -> None:
+        """
+        Delete files from S3 in batches.
+
+        Args:
+            keys: S3 object keys
+
+        Raises:
+            StorageError: If any deletion fails
+        """
+        keys = list(keys)
+        failed = 0
+
+        for key in keys:
+            self._head_cache.pop(key, None)
+
         try:
-            self.s3.delete_object(Bucket=self.bucket_name, Key=key)
-            logger.info(f"Successfully deleted file s3://{self.bucket_name}/{key}")
+            for i in range(0, len(keys), DELETE_BATCH_SIZE):
+                chunk = keys[i:i + DELETE_BATCH_SIZE]
+                response = self.s3.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True}
+                )
+
+                # Quiet mode only reports the keys that failed
+                for error in response.get('Errors', ()):
+                    logger.error(
+                        f"Error deleting s3://{self.bucket_name}/{error.get('Key')}: "
+                        f"{error.get('Code')} {error.get('Message')}"
+                    )
+                    failed += 1
         except ClientError as e:
-            logger.error(f"Error deleting file from S3: {e}")
+            logger.error(f"Error deleting files from S3: {e}")
             raise StorageError(f"Failed to delete file: {str(e)}")
 
+        if failed:
+            raise StorageError(f"Failed to delete {failed} of {len(keys)} files")
+
+        logger.info(f"Successfully deleted {len(keys)} files from s3://{self.bucket_name}")
+
     def get_presigned_url(
         self,
         key: str,
@@ -151,6 +400,9 @@ class S3Client:
         """
         Generate a presigned URL for an S3 object.
 
+        URLs are cached and reused while at least a quarter of their
+        lifetime remains, which skips SigV4 signing on repeated views.
+
         Args:
             key: S3 object key
             expiration: URL expiration time in seconds (default: 1 hour)
@@ -162,17 +414,31 @@ class S3Client:
         Raises:
             StorageError: If URL generation fails
         """
+        cache_key = (key, expiration, operation)
+        now = time.time()
+
+        with self._url_cache_lock:
+            cached = self._url_cache.get(cache_key)
+        if cached and cached[1] - now > expiration * PRESIGNED_URL_MIN_REMAINING:
+            return cached[0]
+
         try:
             url = self.s3.generate_presigned_url(
                 operation,
                 Params={'Bucket': self.bucket_name, 'Key': key},
                 ExpiresIn=expiration
             )
-            return url
         except ClientError as e:
             logger.error(f"Error generating presigned URL: {e}")
             raise StorageError(f"Failed to generate presigned URL: {str(e)}")
 
+        with self._url_cache_lock:
+            if len(self._url_cache) >= PRESIGNED_URL_CACHE_SIZE:
+                self._url_cache.clear()
+            self._url_cache[cache_key] = (url, now + expiration)
+
+        return url
+
     def get_presigned_post(
         self,
         key: str,
@@ -219,7 +485,7 @@ class S3Client:
             True if file exists, False otherwise
         """
         try:
-            self.s3.head_object(Bucket=self.bucket_name, Key=key)
+            self._head(key)
             return True
         except ClientError:
             return False
@@ -238,7 +504,7 @@ class S3Client:
             StorageError: If operation fails
         """
         try:
-            response = self.s3.head_object(Bucket=self.bucket_name, Key=key)
+            response = self._head(key)
             return {
                 'content_type': response.get('ContentType'),
                 'content_length': response.get('ContentLength'),
@@ -250,28 +516,123 @@ class S3Client:
             logger.error(f"Error getting file metadata: {e}")
             raise StorageError(f"Failed to get file metadata: {str(e)}")
 
-    def list_files(self, prefix: str = '', max_keys: int = 1000) -> list:
+    def _head(self, key: str, ttl: float = HEAD_CACHE_TTL) -> Dict[str, Any]:
         """
-        List files in S3 bucket with optional prefix.
+        Get the HeadObject response for a key, reusing a recent one.
+
+        Only successful responses are cached, so a missing key is always
+        re-checked.
 
         Args:
-            prefix: Optional key prefix
-            max_keys: Maximum number of keys to return
+            key: S3 object key
+            ttl: Maximum age in seconds of a cached response
 
         Returns:
-            List of file keys
+            HeadObject response
+
+        Raises:
+            ClientError: If the request fails
+        """
+        now = time.monotonic()
+        cached = self._head_cache.get(key)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+
+        response = self.s3.head_object(Bucket=self.bucket_name, Key=key)
+        self._head_cache[key] = (now, response)
+        return response
+
+    def iter_files(
+        self,
+        prefix: str = '',
+        max_keys: Optional[int] = None,
+        delimiter: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Iterate over file keys in the S3 bucket, following pagination.
+
+        Without a delimiter every key under the prefix is listed, which is
+        the cheapest way to enumerate a subtree (e.g. one user's receipts).
+        With a delimiter only the keys directly under the prefix are
+        listed; use iter_prefixes for the "directories" below it.
+
+        Args:
+            prefix: Optional key prefix
+            max_keys: Optional maximum number of keys to yield
+            delimiter: Optional delimiter (e.g. '/') to list one level only
+
+        Yields:
+            Object keys (never common prefixes)
 
         Raises:
             StorageError: If operation fails
         """
-        try:
-            response = self.s3.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix,
-                MaxKeys=max_keys
-            )
+        for page in self._list_pages(prefix, max_keys, delimiter):
+            for obj in page.get('Contents', ()):
+                yield obj['Key']
+
+    def iter_prefixes(self, prefix: str = '', delimiter: str = '/') -> Iterator[str]:
+        """
+        Iterate over the common prefixes ("directories") directly under a prefix.
+
+        Args:
+            prefix: Optional key prefix
+            delimiter: Delimiter that separates levels of the hierarchy
+
+        Yields:
+            Common prefixes, each ending with the delimiter
+
+        Raises:
+            StorageError: If operation fails
+        """
+        for page in self._list_pages(prefix, None, delimiter):
+            for common_prefix in page.get('CommonPrefixes', ()):
+                yield common_prefix['Prefix']
 
-            return [obj['Key'] for obj in response.get('Contents', [])]
+    def _list_pages(
+        self,
+        prefix: str,
+        max_items: Optional[int],
+        delimiter: Optional[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield ListObjectsV2 pages, raising StorageError on failure."""
+        paginator = self.s3.get_paginator('list_objects_v2')
+        pagination_config = {'PageSize': 1000}
+        if max_items is not None:
+            pagination_config['MaxItems'] = max_items
+
+        kwargs = {
+            'Bucket': self.bucket_name,
+            'Prefix': prefix,
+            'PaginationConfig': pagination_config
+        }
+        if delimiter:
+            kwargs['Delimiter'] = delimiter
+
+        try:
+            yield from paginator.paginate(**kwargs)
         except ClientError as e:
             logger.error(f"Error listing files: {e}")
             raise StorageError(f"Failed to list files: {str(e)}")
+
+    def list_files(
+        self,
+        prefix: str = '',
+        max_keys: Optional[int] = 1000,
+        delimiter: Optional[str] = None
+    ) -> list:
+        """
+        List files in S3 bucket with optional prefix.
+
+        Args:
+            prefix: Optional key prefix
+            max_keys: Maximum number of keys to return (None for all)
+            delimiter: Optional delimiter; see iter_files
+
+        Returns:
+            List of file keys (never common prefixes)
+
+        Raises:
+            StorageError: If operation fails
+        """
+        return list(self.iter_files(prefix, max_keys, delimiter))
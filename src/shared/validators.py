@@ -1,15 +1,21 @@
 """Validation utilities for the expense tracker application."""
 
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
-from datetime import datetime
+from datetime import date
 from decimal import Decimal, InvalidOperation
 
+try:
+    import pybase64 as base64
+except ImportError:  # Fall back to the standard library codec
+    import base64
+
 from .exceptions import ValidationError
 
 
-# Expense categories
-VALID_CATEGORIES = [
+# Expense categories (ordered for error messages; membership uses the set)
+VALID_CATEGORIES = (
     "Food & Dining",
     "Transportation",
     "Shopping",
@@ -20,10 +26,34 @@ VALID_CATEGORIES = [
     "Education",
     "Groceries",
     "Other"
-]
+)
+_VALID_CATEGORIES_SET = frozenset(VALID_CATEGORIES)
+
+# Largest accepted expense amount
+MAX_AMOUNT = Decimal('999999.99')
 
 # Budget periods
-VALID_PERIODS = ["weekly", "monthly"]
+VALID_PERIODS = ("weekly", "monthly")
+_VALID_PERIODS_SET = frozenset(VALID_PERIODS)
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', re.ASCII)
+
+# Password character classes, tracked as bits in a single pass
+_PASSWORD_SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+_HAS_UPPER, _HAS_LOWER, _HAS_DIGIT, _HAS_SPECIAL = 1, 2, 4, 8
+_HAS_ALL = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT | _HAS_SPECIAL
+_PASSWORD_RULES = (
+    (_HAS_UPPER, "Password must contain at least one uppercase letter"),
+    (_HAS_LOWER, "Password must contain at least one lowercase letter"),
+    (_HAS_DIGIT, "Password must contain at least one number"),
+    (_HAS_SPECIAL, "Password must contain at least one special character"),
+)
+
+# Whitespace that line-wrapping base64 encoders insert into the payload
+_BASE64_WHITESPACE = b'\r\n\t '
+
+# A data URI header ("data:image/...;base64,") must end within this many bytes
+_DATA_URI_HEADER_MAX = 64
 
 
 def validate_email(email: str) -> str:
@@ -43,9 +73,8 @@ def validate_email(email: str) -> str:
         raise ValidationError("Email is required")
 
     email = email.strip().lower()
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 
-    if not re.match(pattern, email):
+    if not _EMAIL_RE.match(email):
         raise ValidationError("Invalid email format")
 
     return email
@@ -70,17 +99,25 @@ def validate_password(password: str) -> str:
     if len(password) < 8:
         raise ValidationError("Password must be at least 8 characters long")
 
-    if not re.search(r'[A-Z]', password):
-        raise ValidationError("Password must contain at least one uppercase letter")
-
-    if not re.search(r'[a-z]', password):
-        raise ValidationError("Password must contain at least one lowercase letter")
-
-    if not re.search(r'\d', password):
-        raise ValidationError("Password must contain at least one number")
-
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        raise ValidationError("Password must contain at least one special character")
+    seen = 0
+    for ch in password:
+        if 'A' <= ch <= 'Z':
+            seen |= _HAS_UPPER
+        elif 'a' <= ch <= 'z':
+            seen |= _HAS_LOWER
+        elif '0' <= ch <= '9':
+            seen |= _HAS_DIGIT
+        elif ch in _PASSWORD_SPECIAL_CHARS:
+            seen |= _HAS_SPECIAL
+        else:
+            continue
+
+        if seen == _HAS_ALL:
+            break
+
+    for flag, message in _PASSWORD_RULES:
+        if not seen & flag:
+            raise ValidationError(message)
 
     return password
 
@@ -101,15 +138,25 @@ def validate_amount(amount: Any) -> Decimal:
     if amount is None:
         raise ValidationError("Amount is required")
 
+    # Convert without a str() round-trip except for floats, where the
+    # shortest repr keeps 10.1 from becoming 10.0999999999999996447...
+    amount_type = type(amount)
     try:
-        decimal_amount = Decimal(str(amount))
+        if amount_type is Decimal:
+            decimal_amount = amount
+        elif amount_type is int or amount_type is str:
+            decimal_amount = Decimal(amount)
+        elif amount_type is float:
+            decimal_amount = Decimal(repr(amount))
+        else:
+            decimal_amount = Decimal(str(amount))
     except (InvalidOperation, ValueError):
         raise ValidationError("Invalid amount format")
 
     if decimal_amount <= 0:
         raise ValidationError("Amount must be greater than 0")
 
-    if decimal_amount > Decimal('999999.99'):
+    if decimal_amount > MAX_AMOUNT:
         raise ValidationError("Amount is too large")
 
     # Ensure at most 2 decimal places
@@ -135,8 +182,12 @@ def validate_date(date_str: str) -> str:
     if not date_str:
         raise ValidationError("Date is required")
 
+    # fromisoformat accepts other ISO forms on 3.11+, so pin the shape first
+    if len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-':
+        raise ValidationError("Invalid date format. Use YYYY-MM-DD")
+
     try:
-        datetime.strptime(date_str, '%Y-%m-%d')
+        date.fromisoformat(date_str)
         return date_str
     except ValueError:
         raise ValidationError("Invalid date format. Use YYYY-MM-DD")
@@ -158,7 +209,7 @@ def validate_category(category: str) -> str:
     if not category:
         raise ValidationError("Category is required")
 
-    if category not in VALID_CATEGORIES:
+    if category not in _VALID_CATEGORIES_SET:
         raise ValidationError(
             f"Invalid category. Must be one of: {', '.join(VALID_CATEGORIES)}"
         )
@@ -184,7 +235,7 @@ def validate_period(period: str) -> str:
 
     period = period.lower()
 
-    if period not in VALID_PERIODS:
+    if period not in _VALID_PERIODS_SET:
         raise ValidationError(
             f"Invalid period. Must be one of: {', '.join(VALID_PERIODS)}"
         )
@@ -211,6 +262,12 @@ def validate_required_fields(data: Dict[str, Any], required_fields: List[str]) -
         )
 
 
+@lru_cache(maxsize=32)
+def _normalize_extensions(allowed_extensions: tuple) -> frozenset:
+    """Lower-case a set of allowed extensions once per distinct list."""
+    return frozenset(ext.lower() for ext in allowed_extensions)
+
+
 def validate_file_extension(filename: str, allowed_extensions: List[str]) -> str:
     """
     Validate file extension.
@@ -230,7 +287,7 @@ def validate_file_extension(filename: str, allowed_extensions: List[str]) -> str
 
     extension = filename.lower().rsplit('.', 1)[-1] if '.' in filename else ''
 
-    if not extension or f'.{extension}' not in [ext.lower() for ext in allowed_extensions]:
+    if not extension or f'.{extension}' not in _normalize_extensions(tuple(allowed_extensions)):
         raise ValidationError(
             f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
         )
@@ -268,7 +325,7 @@ def validate_base64_image(base64_string: str) -> str:
         base64_string: Base64-encoded string
 
     Returns:
-        Validated base64 string
+        Validated base64 string with the data URI prefix and whitespace removed
 
     Raises:
         ValidationError: If base64 string is invalid
@@ -276,21 +333,27 @@ def validate_base64_image(base64_string: str) -> str:
     if not base64_string:
         raise ValidationError("Image data is required")
 
-    # Remove data URI prefix if present
-    if ',' in base64_string:
-        header, base64_string = base64_string.split(',', 1)
-        # Validate it's an image
-        if not header.startswith('data:image/'):
-            raise ValidationError("Invalid image format")
+    # Strip line-wrapping whitespace (encode and translate each copy the payload)
+    try:
+        payload = base64_string.encode('ascii').translate(None, _BASE64_WHITESPACE)
+    except UnicodeEncodeError:
+        raise ValidationError("Invalid base64 encoding")
+
+    # Skip a data URI prefix if present; the memoryview slice adds no copy
+    comma = payload.find(b',', 0, _DATA_URI_HEADER_MAX)
+    if comma != -1 and not payload.startswith(b'data:image/'):
+        raise ValidationError("Invalid image format")
+    data = memoryview(payload)[comma + 1:]
 
     # Validate base64 format
     try:
-        import base64
-        base64.b64decode(base64_string, validate=True)
-        return base64_string
+        base64.b64decode(data, validate=True)
     except Exception:
         raise ValidationError("Invalid base64 encoding")
 
+    # The cleaned string handed on to the upload is one more copy
+    return str(data, 'ascii')
+
 
 def validate_threshold(threshold: Any) -> int:
     """
@@ -0,0 +1,192 @@
+"""Integration tests for report generation against mocked DynamoDB."""
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+import time
+from moto import mock_dynamodb
+import boto3
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+
+@pytest.fixture(scope='module')
+def aws_credentials():
+    """Mock AWS Credentials for moto."""
+    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
+    os.environ['AWS_SESSION_TOKEN'] = 'testing'
+    os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
+
+
+@pytest.fixture(scope='module')
+def dynamodb_client(aws_credentials):
+    """Create mock DynamoDB tables used by reports."""
+    with mock_dynamodb():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+
+        dynamodb.create_table(
+            TableName='test-report-expenses',
+            KeySchema=[
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'expense_id', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'user_id', 'AttributeType': 'S'},
+                {'AttributeName': 'expense_id', 'AttributeType': 'S'},
+                {'AttributeName': 'date', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST',
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'user-date-index',
+                    'KeySchema': [
+                        {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'date', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ]
+        )
+
+        dynamodb.create_table(
+            TableName='test-report-cache',
+            KeySchema=[
+                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'report_key', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'user_id', 'AttributeType': 'S'},
+                {'AttributeName': 'report_key', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        dynamodb.create_table(
+            TableName='test-report-users',
+            KeySchema=[{'AttributeName': 'user_id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'user_id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        yield dynamodb
+
+
+@pytest.fixture
+def report_generator(dynamodb_client):
+    """Create a report generator bound to the mock tables."""
+    os.environ['EXPENSES_TABLE'] = 'test-report-expenses'
+    os.environ['USERS_TABLE'] = 'test-report-users'
+    os.environ['BUDGETS_TABLE'] = 'test-report-users'
+    os.environ['REPORT_CACHE_TABLE'] = 'test-report-cache'
+    os.environ['USE_LOCALSTACK'] = 'false'
+
+    from reports.generator import ReportGenerator
+
+    yield ReportGenerator()
+
+    del os.environ['REPORT_CACHE_TABLE']
+    for table_name, key_names in (
+        ('test-report-expenses', ('user_id', 'expense_id')),
+        ('test-report-cache', ('user_id', 'report_key'))
+    ):
+        table = dynamodb_client.Table(table_name)
+        with table.batch_writer() as batch:
+            for item in table.scan()['Items']:
+                batch.delete_item(Key={name: item[name] for name in key_names})
+
+
+def _put_expense(dynamodb_client, expense_id, amount='10.00'):
+    """Write an expense dated today straight to the mock table."""
+    dynamodb_client.Table('test-report-expenses').put_item(Item={
+        'user_id': 'user123',
+        'expense_id': expense_id,
+        'date': datetime.utcnow().strftime('%Y-%m-%d'),
+        'amount': Decimal(amount),
+        'category': 'Groceries',
+        'merchant': 'Walmart'
+    })
+
+
+class TestReportFlow:
+    """Integration tests for report queries."""
+
+    def test_export_to_csv(self, dynamodb_client, report_generator):
+        """Test that the export query is accepted by DynamoDB."""
+        dynamodb_client.Table('test-report-expenses').put_item(Item={
+            'user_id': 'user123',
+            'expense_id': 'exp1',
+            'date': '2024-01-15',
+            'amount': Decimal('45.67'),
+            'category': 'Groceries',
+            'merchant': 'Walmart',
+            'items': [{'description': 'Bananas'}, {'description': 'Milk'}],
+            'receipt_id': 'rec1',
+            'created_at': '2024-01-15T10:00:00'
+        })
+
+        csv_content = report_generator.export_to_csv('user123', '2024-01-01', '2024-01-31')
+
+        lines = csv_content.splitlines()
+        assert lines[0] == 'Date,Merchant,Category,Amount,Items,Receipt ID,Created At'
+        assert lines[1] == '2024-01-15,Walmart,Groceries,$45.67,Bananas; Milk,rec1,2024-01-15T10:00:00'
+
+    def test_report_cache_hit(self, dynamodb_client, report_generator):
+        """Test that a cached report is served until it is invalidated."""
+        _put_expense(dynamodb_client, 'exp1')
+        first = report_generator.generate_weekly_report('user123')
+
+        # Written behind the service's back, so the cache is not invalidated
+        _put_expense(dynamodb_client, 'exp2')
+        second = report_generator.generate_weekly_report('user123')
+
+        assert first['summary']['expense_count'] == 1
+        assert second == first
+
+    def test_report_cache_hit_uses_callers_user(self, dynamodb_client, report_generator):
+        """Test that a cached report carries the user the caller passed in."""
+        _put_expense(dynamodb_client, 'exp1')
+        report_generator.generate_weekly_report('user123')
+
+        report = report_generator.generate_weekly_report(
+            'user123', user={'email': 'new@example.com', 'name': 'New Name'}
+        )
+
+        assert report['user'] == {'user_id': 'user123', 'email': 'new@example.com', 'name': 'New Name'}
+
+    def test_report_cache_miss_after_expiry(self, dynamodb_client, report_generator):
+        """Test that an expired cached report is rebuilt."""
+        from shared.report_cache import REPORT_CACHE_TTL
+
+        _put_expense(dynamodb_client, 'exp1')
+        report_generator.generate_weekly_report('user123')
+        _put_expense(dynamodb_client, 'exp2')
+
+        with patch('reports.generator.time') as mock_time:
+            mock_time.time.return_value = time.time() + REPORT_CACHE_TTL + 1
+            report = report_generator.generate_weekly_report('user123')
+
+        assert report['summary']['expense_count'] == 2
+
+    def test_report_cache_miss_after_expense_write(self, dynamodb_client, report_generator):
+        """Test that expense writes through the service invalidate cached reports."""
+        from expenses.service import ExpenseService
+
+        _put_expense(dynamodb_client, 'exp1')
+        _put_expense(dynamodb_client, 'exp2', amount='5.00')
+        assert report_generator.generate_weekly_report('user123')['summary']['expense_count'] == 2
+
+        ExpenseService().delete_expense('user123', 'exp2')
+        report = report_generator.generate_weekly_report('user123')
+
+        assert report['summary']['expense_count'] == 1
+        assert report['summary']['total_amount'] == 10.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
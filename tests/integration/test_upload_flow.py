@@ -13,7 +13,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def aws_credentials():
     """Mock AWS Credentials for moto."""
     os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
@@ -23,71 +23,96 @@ def aws_credentials():
     os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
 
 
-@pytest.fixture
-def s3_client(aws_credentials):
+@pytest.fixture(scope='module')
+def _aws_mocks(aws_credentials):
+    """Start the moto S3 and DynamoDB backends once for the module."""
+    with mock_s3(), mock_dynamodb():
+        yield
+
+
+@pytest.fixture(scope='module')
+def s3_client(_aws_mocks):
     """Create mock S3 client."""
-    with mock_s3():
-        s3 = boto3.client('s3', region_name='us-east-1')
-        # Create bucket
-        s3.create_bucket(Bucket='test-receipts-bucket')
-        yield s3
+    s3 = boto3.client('s3', region_name='us-east-1')
+    # Create bucket
+    s3.create_bucket(Bucket='test-receipts-bucket')
+    yield s3
 
 
-@pytest.fixture
-def dynamodb_client(aws_credentials):
+@pytest.fixture(scope='module')
+def dynamodb_client(_aws_mocks):
     """Create mock DynamoDB client."""
-    with mock_dynamodb():
-        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-
-        # Create receipts table
-        receipts_table = dynamodb.create_table(
-            TableName='test-receipts',
-            KeySchema=[
-                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
-                {'AttributeName': 'receipt_id', 'KeyType': 'RANGE'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'user_id', 'AttributeType': 'S'},
-                {'AttributeName': 'receipt_id', 'AttributeType': 'S'}
-            ],
-            BillingMode='PAY_PER_REQUEST'
-        )
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+
+    # Create receipts table
+    receipts_table = dynamodb.create_table(
+        TableName='test-receipts',
+        KeySchema=[
+            {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'receipt_id', 'KeyType': 'RANGE'}
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'receipt_id', 'AttributeType': 'S'}
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
 
-        # Create expenses table
-        expenses_table = dynamodb.create_table(
-            TableName='test-expenses',
-            KeySchema=[
-                {'AttributeName': 'user_id', 'KeyType': 'HASH'},
-                {'AttributeName': 'expense_id', 'KeyType': 'RANGE'}
-            ],
-            AttributeDefinitions=[
-                {'AttributeName': 'user_id', 'AttributeType': 'S'},
-                {'AttributeName': 'expense_id', 'AttributeType': 'S'},
-                {'AttributeName': 'date', 'AttributeType': 'S'},
-                {'AttributeName': 'category', 'AttributeType': 'S'}
-            ],
-            BillingMode='PAY_PER_REQUEST',
-            GlobalSecondaryIndexes=[
-                {
-                    'IndexName': 'user-date-index',
-                    'KeySchema': [
-                        {'AttributeName': 'user_id', 'KeyType': 'HASH'},
-                        {'AttributeName': 'date', 'KeyType': 'RANGE'}
-                    ],
-                    'Projection': {'ProjectionType': 'ALL'}
-                },
-                {
-                    'IndexName': 'user-category-index',
-                    'KeySchema': [
-                        {'AttributeName': 'user_id', 'KeyType': 'HASH'},
-                        {'AttributeName': 'category', 'KeyType': 'RANGE'}
-                    ],
-                    'Projection': {'ProjectionType': 'ALL'}
-                }
-            ]
-        )
+    # Create expenses table
+    expenses_table = dynamodb.create_table(
+        TableName='test-expenses',
+        KeySchema=[
+            {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+            {'AttributeName': 'expense_id', 'KeyType': 'RANGE'}
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'user_id', 'AttributeType': 'S'},
+            {'AttributeName': 'expense_id', 'AttributeType': 'S'},
+            {'AttributeName': 'date', 'AttributeType': 'S'},
+            {'AttributeName': 'category', 'AttributeType': 'S'}
+        ],
+        BillingMode='PAY_PER_REQUEST',
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'user-date-index',
+                'KeySchema': [
+                    {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'date', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            },
+            {
+                'IndexName': 'user-category-index',
+                'KeySchema': [
+                    {'AttributeName': 'user_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'category', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }
+        ]
+    )
+
+    yield dynamodb
+
+
+@pytest.fixture(autouse=True)
+def _clean_aws_state(s3_client, dynamodb_client):
+    """Empty the shared bucket and tables after each test."""
+    yield
+
+    listed = s3_client.list_objects_v2(Bucket='test-receipts-bucket')
+    objects = [{'Key': obj['Key']} for obj in listed.get('Contents', [])]
+    if objects:
+        s3_client.delete_objects(Bucket='test-receipts-bucket', Delete={'Objects': objects})
 
-        yield dynamodb
+    for table_name, key_names in (
+        ('test-receipts', ('user_id', 'receipt_id')),
+        ('test-expenses', ('user_id', 'expense_id'))
+    ):
+        table = dynamodb_client.Table(table_name)
+        with table.batch_writer() as batch:
+            for item in table.scan()['Items']:
+                batch.delete_item(Key={name: item[name] for name in key_names})
 
 
 @pytest.fixture
@@ -0,0 +1,53 @@
+"""Unit tests for merchant name deduplication."""
+
+import pytest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from reports._dedup import canonicalize
+
+
+class TestCanonicalize:
+    """Test cases for canonicalize."""
+
+    @pytest.mark.parametrize('name, variant', [
+        ('Walmart', 'WALMART INC.'),
+        ('Walmart', 'Walmart Store #123'),
+        ('Walmart', 'Walmart Supercenter'),
+        ('CVS', 'CVS Pharmacy'),
+        ('CVS', 'CVS/pharmacy #4521'),
+        ('Costco', 'Costco Wholesale'),
+        ('Amazon', 'Amazon.com'),
+        ('Home Depot', 'The Home Depot'),
+        ('7-Eleven', '7 Eleven'),
+        ('Trader Joe\'s', 'TRADER JOES'),
+    ])
+    def test_merges_spellings_of_one_merchant(self, name, variant):
+        """Test that spellings of one merchant get the first name as label."""
+        assert canonicalize([name, variant]) == {name: name, variant: name}
+
+    @pytest.mark.parametrize('name, other', [
+        ('Shell', 'Shellfish Co'),
+        ('Target', 'Targetta'),
+        ('Costco', 'Costco Gas'),
+        ('Store1', 'Store2'),
+        ('Merchant1', 'Merchant11'),
+        ('Market', 'Shop'),
+        ('Starbucks', 'Walmart'),
+    ])
+    def test_keeps_distinct_merchants_apart(self, name, other):
+        """Test that different merchants keep their own labels."""
+        assert canonicalize([name, other]) == {name: name, other: other}
+
+    def test_label_is_first_name_in_input_order(self):
+        """Test that the earliest spelling labels the merged group."""
+        mapping = canonicalize(['WALMART INC.', 'Walmart', 'walmart store #7'])
+
+        assert set(mapping.values()) == {'WALMART INC.'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
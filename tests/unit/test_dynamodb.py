@@ -0,0 +1,211 @@
+"""Unit tests for DynamoDB type conversion and batch operations."""
+
+import pytest
+from decimal import Decimal
+from unittest.mock import Mock, patch
+from moto import mock_dynamodb
+from botocore.exceptions import ClientError
+import boto3
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from shared import dynamodb as dynamodb_module
+from shared.dynamodb import DynamoDBClient, _batch_request, _database_error
+from shared import exceptions
+from shared.exceptions import DatabaseError, ThrottleError
+
+
+class TestDynamoDBConversion:
+    """Test cases for DynamoDBClient type conversion."""
+
+    def test_decimal_integer_to_int(self):
+        """Test that integral Decimals become ints."""
+        value = DynamoDBClient._dynamodb_to_python(Decimal('1'))
+
+        assert value == 1
+        assert isinstance(value, int)
+
+    def test_decimal_with_zero_fraction_to_float(self):
+        """Test that Decimals with a zero fractional part stay floats."""
+        value = DynamoDBClient._dynamodb_to_python(Decimal('1.0'))
+
+        assert value == 1.0
+        assert isinstance(value, float)
+
+    def test_decimal_fraction_to_float(self):
+        """Test that fractional Decimals become floats."""
+        value = DynamoDBClient._dynamodb_to_python(Decimal('1.5'))
+
+        assert value == 1.5
+        assert isinstance(value, float)
+
+    def test_nested_item_to_python(self):
+        """Test conversion of nested DynamoDB items."""
+        item = {
+            'amount': Decimal('45.67'),
+            'items': [{'quantity': Decimal('2'), 'price': Decimal('1.5')}],
+            'merchant': 'Walmart'
+        }
+
+        converted = DynamoDBClient._dynamodb_to_python(item)
+
+        assert converted == {
+            'amount': 45.67,
+            'items': [{'quantity': 2, 'price': 1.5}],
+            'merchant': 'Walmart'
+        }
+        assert isinstance(converted['items'][0]['quantity'], int)
+
+    def test_python_to_dynamodb_does_not_mutate_input(self):
+        """Test that floats are converted to Decimal in a copy of the item."""
+        item = {'amount': 45.67, 'items': [{'price': 1.5}]}
+
+        converted = DynamoDBClient._python_to_dynamodb(item)
+
+        assert converted == {'amount': Decimal('45.67'), 'items': [{'price': Decimal('1.5')}]}
+        assert item == {'amount': 45.67, 'items': [{'price': 1.5}]}
+
+
+@pytest.fixture
+def batch_table():
+    """Create a DynamoDBClient for an empty mock table keyed on 'pk'."""
+    env = {
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'USE_LOCALSTACK': 'false'
+    }
+
+    # A fresh boto3 resource picks up the settings above
+    with patch.dict(os.environ, env), patch.dict(dynamodb_module._RESOURCE_CACHE, clear=True), mock_dynamodb():
+        boto3.resource('dynamodb', region_name='us-east-1').create_table(
+            TableName='test-batch',
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'pk', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield DynamoDBClient('test-batch')
+
+
+class TestDynamoDBBatch:
+    """Test cases for DynamoDBClient batch operations."""
+
+    @pytest.mark.parametrize('count', [10, 120])
+    def test_batch_write_small_and_parallel(self, batch_table, count):
+        """Test that both the batch writer and the parallel path write every item."""
+        items = [{'pk': f'item{i}', 'amount': i + 0.5} for i in range(count)]
+
+        batch_table.batch_write(items)
+
+        stored = batch_table.table.scan()['Items']
+        assert len(stored) == count
+        assert {item['pk']: item['amount'] for item in stored}['item3'] == Decimal('3.5')
+
+    def test_batch_get_splits_and_deduplicates_keys(self, batch_table):
+        """Test that batch_get fetches more than one request's worth of unique keys."""
+        batch_table.batch_write([{'pk': f'item{i}', 'amount': i} for i in range(150)])
+        keys = [{'pk': f'item{i}'} for i in range(150)] + [{'pk': 'item0'}, {'pk': 'missing'}]
+
+        with patch.object(
+            batch_table.dynamodb, 'batch_get_item', wraps=batch_table.dynamodb.batch_get_item
+        ) as batch_get_item:
+            items = batch_table.batch_get(keys)
+
+        assert batch_get_item.call_count == 2
+        assert len(items) == 150
+        assert {item['pk'] for item in items} == {f'item{i}' for i in range(150)}
+        assert all(isinstance(item['amount'], int) for item in items)
+
+    def test_batch_request_retries_unprocessed_entries(self):
+        """Test that unprocessed entries are resent until none remain."""
+        unprocessed = {'test-batch': [{'PutRequest': {'Item': {'pk': 'item1'}}}]}
+        call = Mock(side_effect=[{'UnprocessedItems': unprocessed}, {'UnprocessedItems': {}}])
+
+        with patch.object(dynamodb_module, 'time') as mock_time:
+            responses = _batch_request(call, {'test-batch': []}, 'UnprocessedItems')
+
+        assert len(responses) == 2
+        assert call.call_args.kwargs['RequestItems'] == unprocessed
+        mock_time.sleep.assert_called_once()
+
+    def test_batch_request_gives_up_after_max_retries(self):
+        """Test that entries still unprocessed after every retry raise DatabaseError."""
+        unprocessed = {'test-batch': [{'PutRequest': {'Item': {'pk': 'item1'}}}]}
+        call = Mock(return_value={'UnprocessedItems': unprocessed})
+
+        with patch.object(dynamodb_module, 'time'):
+            with pytest.raises(DatabaseError):
+                _batch_request(call, {'test-batch': []}, 'UnprocessedItems')
+
+        assert call.call_count == dynamodb_module.BATCH_MAX_RETRIES + 1
+
+
+def _client_error(code):
+    """Build a botocore ClientError with the given error code."""
+    return ClientError({'Error': {'Code': code, 'Message': 'error'}}, 'PutItem')
+
+
+class TestDynamoDBErrors:
+    """Test cases for mapping DynamoDB errors to application exceptions."""
+
+    @pytest.mark.parametrize('code', sorted(dynamodb_module.THROTTLING_ERROR_CODES))
+    def test_throttling_codes_map_to_throttle_error(self, code):
+        """Test that throttled requests become 429 ThrottleErrors."""
+        error = _database_error('put item', _client_error(code))
+
+        assert isinstance(error, ThrottleError)
+        assert error.status_code == 429
+
+    @pytest.mark.parametrize('code', ['ValidationException', 'ConditionalCheckFailedException'])
+    def test_other_codes_map_to_database_error(self, code):
+        """Test that other failures become DatabaseErrors naming the operation."""
+        error = _database_error('put item', _client_error(code))
+
+        assert type(error) is DatabaseError
+        assert error.message == 'Failed to put item'
+        assert error.status_code == 500
+
+    def test_client_surfaces_throttle_error(self):
+        """Test that a throttled table call raises ThrottleError from the client."""
+        client = DynamoDBClient.__new__(DynamoDBClient)
+        client.table = Mock()
+        client.table.put_item.side_effect = _client_error('ProvisionedThroughputExceededException')
+
+        with pytest.raises(ThrottleError):
+            client.put_item({'pk': 'item1'})
+
+    @pytest.mark.parametrize('exception_class, status_code, default_message', [
+        (exceptions.ExpenseTrackerException, 500, 'Internal server error'),
+        (exceptions.ValidationError, 400, 'Invalid input'),
+        (exceptions.AuthenticationError, 401, 'Authentication failed'),
+        (exceptions.AuthorizationError, 403, 'Not authorized'),
+        (exceptions.NotFoundError, 404, 'Resource not found'),
+        (exceptions.ConflictError, 409, 'Resource conflict'),
+        (exceptions.OCRProcessingError, 500, 'OCR processing failed'),
+        (exceptions.StorageError, 500, 'Storage operation failed'),
+        (exceptions.DatabaseError, 500, 'Database operation failed'),
+        (exceptions.ThrottleError, 429, 'Too many requests, please retry later'),
+    ])
+    def test_exception_class_defaults(self, exception_class, status_code, default_message):
+        """Test that exceptions take their status and message from class attributes."""
+        error = exception_class()
+
+        assert error.status_code == status_code
+        assert error.message == default_message
+        assert str(error) == default_message
+
+    def test_exception_overrides_stay_on_instance(self):
+        """Test that a per-instance message and status don't change the class defaults."""
+        error = exceptions.NotFoundError('Expense not found', status_code=410)
+
+        assert error.message == 'Expense not found'
+        assert error.status_code == 410
+        assert exceptions.NotFoundError.status_code == 404
+        assert exceptions.NotFoundError().message == 'Resource not found'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -140,6 +140,12 @@ class TestReceiptParser:
         # Should calculate amount from quantity * price
         assert cleaned['amount'] == 3.00
 
+    def test_clean_item_collapses_description_whitespace(self):
+        """Test that item descriptions keep their case but lose extra whitespace."""
+        cleaned = ReceiptParser._clean_item({'description': ' 2%  MILK\n1 gal ', 'amount': 3.49})
+
+        assert cleaned['description'] == '2% MILK 1 gal'
+
     def test_clean_item_no_description(self):
         """Test cleaning item with no description."""
         item = {
@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
+from decimal import Decimal
 import sys
 import os
 
@@ -10,6 +11,18 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from reports.generator import ReportGenerator
+from shared.dynamodb import DynamoDBClient
+
+
+def _normalize_numbers(value):
+    """Turn numbers into the normalized Decimals DynamoDB hands back."""
+    if isinstance(value, dict):
+        return {key: _normalize_numbers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize_numbers(item) for item in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return Decimal(str(value)).normalize()
+    return value
 
 
 class TestReportGenerator:
@@ -18,7 +31,7 @@ class TestReportGenerator:
     @pytest.fixture
     def report_generator(self):
         """Create report generator instance with mocked DynamoDB."""
-        with patch('reports.generator.DynamoDBClient') as mock_db:
+        with patch('reports.generator.get_table') as mock_get_table:
             generator = ReportGenerator()
             generator.expenses_table = Mock()
             generator.budgets_table = Mock()
@@ -114,6 +127,24 @@ class TestReportGenerator:
         assert report['summary']['expense_count'] == 100
         assert report['summary']['total_amount'] == 1500.00  # (50 * 10) + (50 * 20)
 
+    def test_total_exact_across_pages(self, report_generator):
+        """Test that the total is summed exactly over every page, not per page."""
+        def page(*amounts):
+            return [{'amount': amount, 'category': 'Other', 'merchant': 'Store', 'date': '2024-01-15'}
+                    for amount in amounts]
+
+        # Summed per page, 1e16 + 1.0 rounds away the 1.0
+        report_generator.expenses_table.query.side_effect = [
+            {'items': page(1e16, 1.0), 'last_evaluated_key': {'key': 'value1'}},
+            {'items': page(1.0), 'last_evaluated_key': {'key': 'value2'}},
+            {'items': page(-1e16), 'last_evaluated_key': None}
+        ]
+        report_generator.users_table.get_item.return_value = {}
+
+        report = report_generator.generate_weekly_report('user123')
+
+        assert report['summary']['total_amount'] == 2.0
+
     def test_export_to_csv(self, report_generator, sample_expenses):
         """Test CSV export."""
         report_generator.expenses_table.query.return_value = {
@@ -129,6 +160,31 @@ class TestReportGenerator:
         assert 'Starbucks' in csv_content
         assert '45.67' in csv_content
 
+    def test_report_queries_use_projection(self, report_generator, sample_expenses):
+        """Test that report and export queries only fetch the attributes they use."""
+        report_generator.expenses_table.query.return_value = {
+            'items': sample_expenses,
+            'last_evaluated_key': None
+        }
+
+        report_generator.generate_weekly_report('user123')
+        report_kwargs = report_generator.expenses_table.query.call_args.kwargs
+
+        report_generator.export_to_csv('user123', '2024-01-01', '2024-01-31')
+        export_kwargs = report_generator.expenses_table.query.call_args.kwargs
+
+        assert report_kwargs['projection_expression'] == 'amount, category, merchant, #date'
+        assert report_kwargs['expression_names'] == {'#date': 'date'}
+        assert 'receipt_id' in export_kwargs['projection_expression']
+        assert export_kwargs['expression_names'] == {'#date': 'date', '#items': 'items'}
+
+        # DynamoDB rejects unaliased reserved words as well as unused or missing names
+        for kwargs in (report_kwargs, export_kwargs):
+            attributes = [name.strip() for name in kwargs['projection_expression'].split(',')]
+            placeholders = {name for name in attributes if name.startswith('#')}
+            assert placeholders == set(kwargs['expression_names'])
+            assert not {'date', 'items', 'name'} & set(attributes)
+
     def test_format_report_html(self, report_generator):
         """Test HTML formatting."""
         report = {
@@ -187,6 +243,52 @@ class TestReportGenerator:
         # Should only have top 10 merchants
         assert len(report['top_merchants']) == 10
 
+    def test_top_merchants_merge_spellings(self, report_generator):
+        """Test that spellings of one merchant are grouped together."""
+        expenses = [
+            {'amount': 10.0, 'merchant': 'Walmart', 'category': 'Shopping', 'date': '2024-01-15'},
+            {'amount': 20.0, 'merchant': 'WALMART INC.', 'category': 'Shopping', 'date': '2024-01-15'},
+            {'amount': 5.0, 'merchant': 'Walmart Store #123', 'category': 'Shopping', 'date': '2024-01-15'},
+            {'amount': 7.0, 'merchant': 'Walmart', 'category': 'Shopping', 'date': '2024-01-16'},
+            {'amount': 3.0, 'merchant': 'Store1', 'category': 'Shopping', 'date': '2024-01-16'},
+            {'amount': 4.0, 'merchant': 'Store2', 'category': 'Shopping', 'date': '2024-01-16'},
+        ]
+
+        report_generator.expenses_table.query.return_value = {
+            'items': expenses,
+            'last_evaluated_key': None
+        }
+        report_generator.users_table.get_item.return_value = {}
+
+        report = report_generator.generate_weekly_report('user123')
+
+        assert report['top_merchants'] == [
+            {'name': 'Walmart', 'amount': 42.0, 'count': 4},
+            {'name': 'Store2', 'amount': 4.0, 'count': 1},
+            {'name': 'Store1', 'amount': 3.0, 'count': 1},
+        ]
+
+    def test_report_with_sharded_queries(self, report_generator):
+        """Test that sharded date-range queries are combined into one report."""
+        def query(**kwargs):
+            # One expense on the first day of each queried sub-range
+            date_condition = kwargs['key_condition_expression'].get_expression()['values'][1]
+            day = date_condition.get_expression()['values'][1]
+            return {
+                'items': [{'amount': 10.0, 'category': 'Shopping', 'merchant': 'Target', 'date': day}],
+                'last_evaluated_key': None
+            }
+
+        report_generator.expenses_table.query.side_effect = query
+        report_generator.users_table.get_item.return_value = {}
+
+        with patch('reports.generator.REPORT_QUERY_SHARDS', 7):
+            report = report_generator.generate_weekly_report('user123')
+
+        assert report_generator.expenses_table.query.call_count == 7
+        assert report['summary']['total_amount'] == 70.0
+        assert len(report['daily_spending']) == 7
+
     def test_report_with_no_expenses(self, report_generator):
         """Test report generation with no expenses."""
         report_generator.expenses_table.query.return_value = {
@@ -206,6 +308,34 @@ class TestReportGenerator:
         assert report['summary']['expense_count'] == 0
         assert report['summary']['average_expense'] == 0.0
 
+    def test_cached_report_keeps_float_types(self, report_generator):
+        """Test that a report served from the cache has the types of a fresh one."""
+        report_generator.expenses_table.query.return_value = {
+            'items': [
+                {'amount': 75.0, 'merchant': 'Walmart', 'category': 'Groceries', 'date': '2024-01-15'},
+                {'amount': 25.0, 'merchant': 'Target', 'category': 'Shopping', 'date': '2024-01-16'}
+            ],
+            'last_evaluated_key': None
+        }
+        report_generator.users_table.get_item.return_value = {}
+
+        # DynamoDB returns numbers normalized, so a stored 100.0 reads back as 100
+        stored = {}
+        report_cache = Mock()
+        report_cache.put_item.side_effect = lambda item: stored.update(item)
+        report_cache.batch_get.side_effect = lambda keys: [
+            DynamoDBClient._dynamodb_to_python(_normalize_numbers(stored))
+        ] if stored else []
+        report_generator.report_cache = report_cache
+
+        fresh = report_generator.generate_weekly_report('user123')
+        cached = report_generator.generate_weekly_report('user123')
+
+        assert report_generator.expenses_table.query.call_count == 1
+        assert cached == fresh
+        assert isinstance(cached['summary']['total_amount'], float)
+        assert isinstance(cached['by_category']['Groceries']['percentage'], float)
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,166 @@
+"""Unit tests for the reports Lambda handler."""
+
+import pytest
+from unittest.mock import Mock, patch
+import base64
+import gzip
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+
+@pytest.fixture(scope='module')
+def handler():
+    """Import the handler, whose module-level clients need a region, credentials and table names."""
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    for table_env in ('EXPENSES_TABLE', 'BUDGETS_TABLE', 'USERS_TABLE'):
+        os.environ.setdefault(table_env, 'test-table')
+
+    from reports import handler
+    return handler
+
+
+class TestReportsHandler:
+    """Test cases for the reports handler."""
+
+    @pytest.fixture
+    def expenses_table(self, handler):
+        """Mock the expenses table behind the handler's report generator."""
+        table = Mock()
+        table.query.return_value = {
+            'items': [{
+                'date': '2024-01-15',
+                'merchant': 'Walmart',
+                'category': 'Groceries',
+                'amount': 45.67,
+                'items': [{'description': 'Bananas'}],
+                'receipt_id': 'rec1',
+                'created_at': '2024-01-15T10:00:00'
+            }],
+            'last_evaluated_key': None
+        }
+
+        with patch.object(handler.report_generator, 'expenses_table', table):
+            yield table
+
+    @staticmethod
+    def _export_event(headers):
+        return {
+            'httpMethod': 'GET',
+            'path': '/reports/export',
+            'headers': headers,
+            'queryStringParameters': {'start_date': '2024-01-01', 'end_date': '2024-01-31'},
+            'requestContext': {'authorizer': {'claims': {'sub': 'user123'}}}
+        }
+
+    def test_export_gzip_when_accepted(self, handler, expenses_table):
+        """Test that exports are gzipped for clients that accept gzip."""
+        response = handler.lambda_handler(
+            self._export_event({'accept': 'text/csv', 'accept-encoding': 'gzip, deflate, br'}), None
+        )
+
+        assert response['statusCode'] == 200
+        assert response['headers']['Content-Encoding'] == 'gzip'
+        assert response['isBase64Encoded'] is True
+
+        csv_content = gzip.decompress(base64.b64decode(response['body'])).decode('utf-8')
+        assert csv_content.splitlines() == [
+            'Date,Merchant,Category,Amount,Items,Receipt ID,Created At',
+            '2024-01-15,Walmart,Groceries,$45.67,Bananas,rec1,2024-01-15T10:00:00'
+        ]
+
+    @pytest.mark.parametrize('headers', [
+        None,
+        {'Accept': 'text/csv', 'Accept-Encoding': 'identity'},
+        {'Accept': 'text/csv', 'Accept-Encoding': 'gzip;q=0, deflate'},
+        # Without Accept: text/csv first, API Gateway would not decode a binary body
+        {'Accept-Encoding': 'gzip, deflate'},
+        {'Accept': '*/*', 'Accept-Encoding': 'gzip'},
+        {'Accept': 'text/html, text/csv', 'Accept-Encoding': 'gzip'},
+    ])
+    def test_export_plain_csv_otherwise(self, handler, expenses_table, headers):
+        """Test that other clients get the plain CSV body."""
+        response = handler.lambda_handler(self._export_event(headers), None)
+
+        assert response['statusCode'] == 200
+        assert 'Content-Encoding' not in response['headers']
+        assert not response.get('isBase64Encoded')
+        assert response['headers']['Content-Type'] == 'text/csv'
+        assert response['body'].splitlines()[1] == (
+            '2024-01-15,Walmart,Groceries,$45.67,Bananas,rec1,2024-01-15T10:00:00'
+        )
+
+    def test_email_report_reads_user_once(self, handler, expenses_table):
+        """Test that the email report reuses the handler's user lookup."""
+        users_table = Mock()
+        users_table.get_item.return_value = {'email': 'test@example.com', 'name': 'Test User'}
+        generator_users_table = Mock()
+        email_service = Mock()
+        email_service.send_report_email.return_value = {'message_id': 'msg1'}
+
+        with patch.object(handler, 'users_table', users_table), \
+                patch.dict(handler._USER_CACHE, clear=True), \
+                patch.object(handler.report_generator, 'users_table', generator_users_table), \
+                patch.object(handler.report_generator, 'report_cache', None), \
+                patch.object(handler, 'email_service', email_service):
+            response = handler.lambda_handler({
+                'httpMethod': 'POST',
+                'path': '/reports/email',
+                'body': '{"report_type": "weekly"}',
+                'requestContext': {'authorizer': {'claims': {'sub': 'user123'}}}
+            }, None)
+
+        assert response['statusCode'] == 200
+        users_table.get_item.assert_called_once()
+        generator_users_table.get_item.assert_not_called()
+        assert email_service.send_report_email.call_args.kwargs['recipient_email'] == 'test@example.com'
+
+    def test_email_report_user_not_found(self, handler, expenses_table):
+        """Test that a missing user is reported before any report work."""
+        users_table = Mock()
+        users_table.get_item.return_value = None
+
+        with patch.object(handler, 'users_table', users_table), patch.dict(handler._USER_CACHE, clear=True):
+            response = handler.lambda_handler({
+                'httpMethod': 'POST',
+                'path': '/reports/email',
+                'body': '{"report_type": "monthly"}',
+                'requestContext': {'authorizer': {'claims': {'sub': 'user123'}}}
+            }, None)
+
+        assert response['statusCode'] == 404
+        expenses_table.query.assert_not_called()
+
+    def test_user_cached_for_ttl(self, handler):
+        """Test that warm invocations reuse the user until USER_CACHE_TTL passes."""
+        users_table = Mock()
+        users_table.get_item.return_value = {'email': 'test@example.com', 'name': 'Test User'}
+
+        with patch.object(handler, 'users_table', users_table), \
+                patch.dict(handler._USER_CACHE, clear=True), \
+                patch.object(handler, 'time') as mock_time:
+            mock_time.monotonic.return_value = 1000.0
+            assert handler._get_user_cached('user123')['email'] == 'test@example.com'
+            assert handler._get_user_cached('user123')['email'] == 'test@example.com'
+            assert users_table.get_item.call_count == 1
+
+            mock_time.monotonic.return_value = 1000.0 + handler.USER_CACHE_TTL
+            handler._get_user_cached('user123')
+            assert users_table.get_item.call_count == 2
+
+    def test_missing_user_not_cached(self, handler):
+        """Test that a user without an email is looked up again next time."""
+        users_table = Mock()
+        users_table.get_item.side_effect = [None, {'email': 'test@example.com'}]
+
+        with patch.object(handler, 'users_table', users_table), patch.dict(handler._USER_CACHE, clear=True):
+            assert handler._get_user_cached('user123') is None
+            assert handler._get_user_cached('user123') == {'email': 'test@example.com'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
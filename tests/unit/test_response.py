@@ -0,0 +1,108 @@
+"""Unit tests for Lambda response helpers."""
+
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from decimal import Decimal
+import base64
+import json
+import sys
+import os
+
+msgpack = pytest.importorskip('msgpack')
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from shared import response
+from shared.response import success_response, get_header, MSGPACK_CONTENT_TYPE
+
+
+class TestSuccessResponse:
+    """Test cases for success_response content negotiation."""
+
+    DATA = {'total': Decimal('12.50'), 'generated_at': datetime(2024, 1, 15, 10, 0)}
+
+    def test_json_by_default(self):
+        """Test that responses are JSON without an Accept header."""
+        result = success_response(data=self.DATA)
+
+        assert result['headers']['Content-Type'] == 'application/json'
+        assert 'isBase64Encoded' not in result
+        assert 'Vary' not in result['headers']
+        assert json.loads(result['body'])['data'] == {
+            'total': 12.5,
+            'generated_at': '2024-01-15T10:00:00'
+        }
+
+    def test_json_for_other_accept_headers(self):
+        """Test that clients asking for JSON keep getting JSON."""
+        result = success_response(data=self.DATA, accept='application/json, */*')
+
+        assert result['headers']['Content-Type'] == 'application/json'
+        assert result['headers']['Vary'] == 'Accept'
+        assert json.loads(result['body'])['success'] is True
+
+    @pytest.mark.parametrize('accept', [
+        '',
+        f'application/json, {MSGPACK_CONTENT_TYPE}',   # API Gateway only decodes for the first type
+        f'{MSGPACK_CONTENT_TYPE};q=0, application/json',
+        'application/x-msgpack-extended',
+    ])
+    def test_json_unless_msgpack_is_first_and_acceptable(self, accept):
+        """Test that MessagePack is only sent when it is the first acceptable media type."""
+        result = success_response(data=self.DATA, accept=accept)
+
+        assert result['headers']['Content-Type'] == 'application/json'
+        assert result['headers']['Vary'] == 'Accept'
+        assert 'isBase64Encoded' not in result
+
+    def test_msgpack_when_accepted(self):
+        """Test that an Accept of application/x-msgpack gets a base64 MessagePack body."""
+        result = success_response(
+            data=self.DATA,
+            message='ok',
+            headers={'X-Extra': '1'},
+            accept=f'{MSGPACK_CONTENT_TYPE}, application/json;q=0.5'
+        )
+
+        assert result['isBase64Encoded'] is True
+        assert result['headers']['Content-Type'] == MSGPACK_CONTENT_TYPE
+        assert result['headers']['X-Extra'] == '1'
+        assert result['headers']['Vary'] == 'Accept'
+        assert msgpack.unpackb(base64.b64decode(result['body'])) == {
+            'success': True,
+            'data': {'total': 12.5, 'generated_at': '2024-01-15T10:00:00'},
+            'message': 'ok'
+        }
+
+        # The shared default headers are never modified
+        assert response.DEFAULT_HEADERS['Content-Type'] == 'application/json'
+
+    def test_json_when_msgpack_unavailable(self):
+        """Test that JSON is returned when msgpack isn't installed."""
+        with patch.object(response, 'msgpack', None):
+            result = success_response(data=self.DATA, accept=MSGPACK_CONTENT_TYPE)
+
+        assert result['headers']['Content-Type'] == 'application/json'
+        assert json.loads(result['body'])['data']['total'] == 12.5
+
+
+class TestGetHeader:
+    """Test cases for get_header."""
+
+    @pytest.mark.parametrize('name', ['Accept-Encoding', 'accept-encoding', 'ACCEPT-ENCODING'])
+    def test_lookup_ignores_case(self, name):
+        """Test that headers are found however the client cased them."""
+        event = {'headers': {name: 'gzip'}}
+
+        assert get_header(event, 'Accept-Encoding') == 'gzip'
+
+    def test_missing_header_returns_default(self):
+        """Test that absent headers (or a null headers map) return the default."""
+        assert get_header({'headers': None}, 'Accept') is None
+        assert get_header({}, 'Accept', '') == ''
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,276 @@
+"""Unit tests for the S3 client wrapper."""
+
+import pytest
+from unittest.mock import patch
+import base64
+import binascii
+from moto import mock_s3
+from botocore.exceptions import ClientError
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from shared import s3 as s3_module
+from shared.s3 import S3Client
+from shared.exceptions import StorageError
+
+
+@pytest.fixture
+def s3_client():
+    """Create an S3Client for an empty mock bucket."""
+    env = {
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        # moto doesn't validate the newer default request checksums
+        'AWS_REQUEST_CHECKSUM_CALCULATION': 'when_required',
+        'AWS_RESPONSE_CHECKSUM_VALIDATION': 'when_required'
+    }
+
+    # A fresh boto3 client picks up the settings above
+    with patch.dict(os.environ, env), patch.dict(s3_module._CLIENT_CACHE, clear=True), mock_s3():
+        client = S3Client('test-bucket')
+        client.s3.create_bucket(Bucket='test-bucket')
+        yield client
+
+
+class TestS3Client:
+    """Test cases for S3Client."""
+
+    def test_iter_files_lists_every_key_without_delimiter(self, s3_client):
+        """Test that the whole subtree is listed without a delimiter."""
+        for key in ('receipts/u1/a.png', 'receipts/u1/2024/b.png', 'receipts/u2/c.png'):
+            s3_client.upload_file(b'data', key)
+
+        assert sorted(s3_client.iter_files('receipts/u1/')) == [
+            'receipts/u1/2024/b.png',
+            'receipts/u1/a.png'
+        ]
+
+    def test_iter_files_and_prefixes_with_delimiter(self, s3_client):
+        """Test that keys and common prefixes are listed separately."""
+        for key in ('receipts/top.png', 'receipts/u1/a.png', 'receipts/u2/b.png'):
+            s3_client.upload_file(b'data', key)
+
+        assert s3_client.list_files('receipts/', delimiter='/') == ['receipts/top.png']
+        assert list(s3_client.iter_prefixes('receipts/')) == ['receipts/u1/', 'receipts/u2/']
+
+    def test_decode_base64_carries_across_slices(self):
+        """Test that quanta split across slices and line wrapping decode correctly."""
+        content = bytes(range(256)) * 4
+        encoded = base64.encodebytes(content).decode('ascii').replace('\n', '\r\n')
+
+        # 10-character slices split both quanta and the CRLF line breaks
+        with patch.object(s3_module, 'BASE64_CHUNK_SIZE', 10):
+            with S3Client._decode_base64(encoded) as decoded:
+                assert decoded.read() == content
+
+    @pytest.mark.parametrize('encoded', [
+        base64.b64encode(b'receipt').decode('ascii')[:-1],   # truncated final quantum
+        'cmVj*ZWlwdA==',                                      # character outside the alphabet
+    ])
+    def test_decode_base64_rejects_bad_input(self, encoded):
+        """Test that truncated or non-base64 input raises instead of decoding partially."""
+        with patch.object(s3_module, 'BASE64_CHUNK_SIZE', 4):
+            with pytest.raises(binascii.Error):
+                S3Client._decode_base64(encoded)
+
+    def test_upload_base64_invalid_raises_storage_error(self, s3_client):
+        """Test that upload_base64 reports undecodable content as StorageError."""
+        with pytest.raises(StorageError):
+            s3_client.upload_base64('cmVjZWlwdA=', 'receipts/a.png')
+
+        assert not s3_client.file_exists('receipts/a.png')
+
+    def test_upload_base64_round_trip(self, s3_client):
+        """Test that wrapped base64 content is stored decoded."""
+        content = bytes(range(256)) * 300
+        encoded = base64.encodebytes(content).decode('ascii')
+
+        s3_client.upload_base64(encoded, 'receipts/a.png', content_type='image/png')
+
+        assert s3_client.download_file('receipts/a.png') == content
+
+    def test_upload_file_multipart_at_threshold(self, s3_client):
+        """Test that uploads at the multipart threshold go through upload_fileobj."""
+        content = b'\x01' * s3_module.TRANSFER_CONFIG.multipart_threshold
+
+        with patch.object(s3_client.s3, 'upload_fileobj', wraps=s3_client.s3.upload_fileobj) as upload_fileobj, \
+                patch.object(s3_client.s3, 'put_object', wraps=s3_client.s3.put_object) as put_object:
+            s3_client.upload_file(content, 'receipts/big.bin', content_type='application/octet-stream')
+
+        upload_fileobj.assert_called_once()
+        assert upload_fileobj.call_args.kwargs['ExtraArgs'] == {
+            'ServerSideEncryption': 'AES256',
+            'ContentType': 'application/octet-stream'
+        }
+        put_object.assert_not_called()
+        assert s3_client.get_file_metadata('receipts/big.bin')['content_length'] == len(content)
+
+    def test_upload_file_below_threshold_uses_put_object(self, s3_client):
+        """Test that smaller uploads are a single PutObject."""
+        with patch.object(s3_client.s3, 'upload_fileobj') as upload_fileobj:
+            s3_client.upload_file(b'data', 'receipts/a.png')
+
+        upload_fileobj.assert_not_called()
+        assert s3_client.download_file('receipts/a.png') == b'data'
+
+    def test_list_files_max_keys(self, s3_client):
+        """Test that list_files stops after max_keys keys."""
+        for i in range(5):
+            s3_client.upload_file(b'data', f'receipts/{i}.png')
+
+        assert len(s3_client.list_files('receipts/', max_keys=3)) == 3
+
+    def test_download_file_stream(self, s3_client):
+        """Test that streamed chunks reassemble the object."""
+        content = bytes(range(256)) * 40
+        s3_client.upload_file(content, 'receipts/big.bin')
+
+        chunks = list(s3_client.download_file_stream('receipts/big.bin', chunk_size=1000))
+
+        assert b''.join(chunks) == content
+        assert max(len(chunk) for chunk in chunks) <= 1000
+
+    def test_download_file_stream_missing_key(self, s3_client):
+        """Test that a missing object raises StorageError."""
+        with pytest.raises(StorageError):
+            list(s3_client.download_file_stream('receipts/missing.bin'))
+
+    def test_download_file_parallel_ranges(self, s3_client):
+        """Test that ranged downloads reassemble the object in order."""
+        content = bytes(range(256)) * 40
+        s3_client.upload_file(content, 'receipts/big.bin')
+
+        with patch.object(s3_module, 'DOWNLOAD_RANGE_SIZE', 1000), \
+                patch.object(s3_client.s3, 'get_object', wraps=s3_client.s3.get_object) as get_object:
+            data = s3_client.download_file_parallel('receipts/big.bin')
+
+        assert data == content
+        # 10240 bytes in 1000-byte ranges
+        assert get_object.call_count == 11
+
+    def test_download_file_parallel_pins_etag(self, s3_client):
+        """Test that every range is pinned to the ETag the download started with."""
+        s3_client.upload_file(bytes(range(256)) * 40, 'receipts/big.bin')
+        etag = s3_client.s3.head_object(Bucket='test-bucket', Key='receipts/big.bin')['ETag']
+
+        with patch.object(s3_module, 'DOWNLOAD_RANGE_SIZE', 1000), \
+                patch.object(s3_client.s3, 'get_object', wraps=s3_client.s3.get_object) as get_object:
+            s3_client.download_file_parallel('receipts/big.bin')
+
+        assert {call.kwargs['IfMatch'] for call in get_object.call_args_list} == {etag}
+
+    def test_download_file_parallel_object_overwritten(self, s3_client):
+        """Test that an overwrite during the download raises instead of mixing versions."""
+        s3_client.upload_file(bytes(range(256)) * 40, 'receipts/big.bin')
+        get_object = s3_client.s3.get_object
+
+        def overwrite_then_get(**kwargs):
+            # Overwritten after the HeadObject, before the first range is read
+            s3_client.s3.put_object(Bucket='test-bucket', Key='receipts/big.bin', Body=b'x' * 10240)
+            return get_object(**kwargs)
+
+        # One worker keeps the ranges serial, so only one is in flight at the overwrite
+        with patch.object(s3_module, 'DOWNLOAD_RANGE_SIZE', 1000), \
+                patch.object(s3_module, 'DOWNLOAD_WORKERS', 1), \
+                patch.object(s3_client.s3, 'get_object', side_effect=overwrite_then_get):
+            with pytest.raises(StorageError, match='PreconditionFailed'):
+                s3_client.download_file_parallel('receipts/big.bin')
+
+    def test_download_file_parallel_small_object(self, s3_client):
+        """Test that objects within one range are fetched in a single request."""
+        s3_client.upload_file(b'small', 'receipts/small.bin')
+
+        assert s3_client.download_file_parallel('receipts/small.bin') == b'small'
+
+    def test_download_file_parallel_missing_key(self, s3_client):
+        """Test that a missing object raises StorageError."""
+        with pytest.raises(StorageError):
+            s3_client.download_file_parallel('receipts/missing.bin')
+
+    def test_delete_files_in_batches(self, s3_client):
+        """Test that deletes are batched and remove every key."""
+        keys = [f'receipts/{i}.png' for i in range(5)]
+        for key in keys:
+            s3_client.upload_file(b'data', key)
+
+        with patch.object(s3_module, 'DELETE_BATCH_SIZE', 2), \
+                patch.object(s3_client.s3, 'delete_objects', wraps=s3_client.s3.delete_objects) as delete_objects:
+            s3_client.delete_files(keys)
+
+        assert delete_objects.call_count == 3
+        assert s3_client.list_files('receipts/') == []
+
+    def test_delete_files_reports_failed_keys(self, s3_client):
+        """Test that per-key errors from DeleteObjects raise StorageError."""
+        response = {'Errors': [{'Key': 'receipts/a.png', 'Code': 'AccessDenied', 'Message': 'Denied'}]}
+
+        with patch.object(s3_client.s3, 'delete_objects', return_value=response):
+            with pytest.raises(StorageError, match='1 of 2'):
+                s3_client.delete_files(['receipts/a.png', 'receipts/b.png'])
+
+    def test_head_responses_cached_for_ttl(self, s3_client):
+        """Test that HeadObject is reused within the TTL and refetched after it."""
+        s3_client.upload_file(b'data', 'receipts/a.png', content_type='image/png')
+
+        with patch.object(s3_client.s3, 'head_object', wraps=s3_client.s3.head_object) as head_object, \
+                patch.object(s3_module, 'time') as mock_time:
+            mock_time.monotonic.side_effect = [100.0, 101.0, 106.0]
+
+            assert s3_client.file_exists('receipts/a.png')
+            assert s3_client.get_file_metadata('receipts/a.png')['content_type'] == 'image/png'
+            assert head_object.call_count == 1
+
+            # Past HEAD_CACHE_TTL the object is checked again
+            assert s3_client.file_exists('receipts/a.png')
+            assert head_object.call_count == 2
+
+    def test_head_cache_dropped_on_write_and_missing_keys_not_cached(self, s3_client):
+        """Test that uploads and deletes invalidate cached HeadObject responses."""
+        assert not s3_client.file_exists('receipts/a.png')
+
+        s3_client.upload_file(b'data', 'receipts/a.png')
+        assert s3_client.file_exists('receipts/a.png')
+
+        s3_client.upload_file(b'longer data', 'receipts/a.png')
+        assert s3_client.get_file_metadata('receipts/a.png')['content_length'] == 11
+
+        s3_client.delete_file('receipts/a.png')
+        assert not s3_client.file_exists('receipts/a.png')
+
+    def test_presigned_url_reused_until_lifetime_mostly_spent(self, s3_client):
+        """Test that presigned URLs are reused while enough lifetime remains."""
+        with patch.object(
+            s3_client.s3, 'generate_presigned_url', side_effect=['url-1', 'url-2', 'url-3']
+        ) as generate, patch.object(s3_module, 'time') as mock_time:
+            mock_time.time.return_value = 1000.0
+            assert s3_client.get_presigned_url('receipts/a.png', expiration=100) == 'url-1'
+
+            # 70s in, 30% of the lifetime remains
+            mock_time.time.return_value = 1070.0
+            assert s3_client.get_presigned_url('receipts/a.png', expiration=100) == 'url-1'
+
+            # 80s in, only 20% remains
+            mock_time.time.return_value = 1080.0
+            assert s3_client.get_presigned_url('receipts/a.png', expiration=100) == 'url-2'
+
+            # Different expirations are cached separately
+            assert s3_client.get_presigned_url('receipts/a.png', expiration=60) == 'url-3'
+
+        assert generate.call_count == 3
+
+    def test_presigned_url_error(self, s3_client):
+        """Test that signing failures raise StorageError and are not cached."""
+        error = ClientError({'Error': {'Code': 'InvalidRequest', 'Message': 'bad'}}, 'GeneratePresignedUrl')
+
+        with patch.object(s3_client.s3, 'generate_presigned_url', side_effect=[error, 'url-1']):
+            with pytest.raises(StorageError):
+                s3_client.get_presigned_url('receipts/a.png')
+            assert s3_client.get_presigned_url('receipts/a.png') == 'url-1'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
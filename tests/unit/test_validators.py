@@ -0,0 +1,152 @@
+"""Unit tests for input validators."""
+
+import pytest
+from decimal import Decimal
+import base64
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from shared.validators import (
+    validate_amount,
+    validate_base64_image,
+    validate_date,
+    validate_password
+)
+from shared.exceptions import ValidationError
+
+
+class TestValidateDate:
+    """Test cases for validate_date."""
+
+    @pytest.mark.parametrize('value', ['2024-01-05', '2024-02-29', '1999-12-31'])
+    def test_valid_dates(self, value):
+        """Test that zero-padded YYYY-MM-DD dates are returned unchanged."""
+        assert validate_date(value) == value
+
+    @pytest.mark.parametrize('value', [
+        '2024-1-5',      # not zero-padded
+        '2024-01-5',
+        '20240105',      # other ISO 8601 forms fromisoformat accepts
+        '2024-W01-1',
+        '2024/01/05',
+        '2024-13-01',    # right shape, impossible date
+        '2023-02-29',
+        '2024-01-05T10:00:00',
+    ])
+    def test_invalid_dates(self, value):
+        """Test that anything but a real YYYY-MM-DD date is rejected."""
+        with pytest.raises(ValidationError, match='YYYY-MM-DD'):
+            validate_date(value)
+
+    def test_missing_date(self):
+        """Test that an empty date is rejected as missing."""
+        with pytest.raises(ValidationError, match='required'):
+            validate_date('')
+
+
+class TestValidateAmount:
+    """Test cases for validate_amount."""
+
+    def test_decimal_returned_as_is(self):
+        """Test that Decimals are passed through without conversion."""
+        amount = Decimal('12.50')
+
+        assert validate_amount(amount) is amount
+
+    @pytest.mark.parametrize('value, expected', [
+        (12, Decimal('12')),
+        ('12.50', Decimal('12.50')),
+        (10.1, Decimal('10.1')),      # shortest repr, not the binary expansion
+        (0.29, Decimal('0.29')),
+    ])
+    def test_int_str_and_float(self, value, expected):
+        """Test that ints, strings and floats convert to the exact Decimal."""
+        result = validate_amount(value)
+
+        assert result == expected
+        assert result.as_tuple() == expected.as_tuple()
+
+    def test_other_types_use_str(self):
+        """Test that other numeric-like types are converted through str()."""
+        class Amount:
+            def __str__(self):
+                return '7.25'
+
+        assert validate_amount(Amount()) == Decimal('7.25')
+
+    @pytest.mark.parametrize('value, message', [
+        (None, 'required'),
+        ('abc', 'Invalid amount format'),
+        (0, 'greater than 0'),
+        ('-5', 'greater than 0'),
+        ('1000000', 'too large'),
+        (10.123, 'at most 2 decimal places'),
+        ('1.005', 'at most 2 decimal places'),
+    ])
+    def test_invalid_amounts(self, value, message):
+        """Test that missing, malformed and out-of-range amounts are rejected."""
+        with pytest.raises(ValidationError, match=message):
+            validate_amount(value)
+
+
+class TestValidatePassword:
+    """Test cases for validate_password."""
+
+    @pytest.mark.parametrize('password', ['Passw0rd!', 'aB3$aaaa', 'ÄäPassword1?'])
+    def test_valid_passwords(self, password):
+        """Test that passwords with every character class are accepted."""
+        assert validate_password(password) == password
+
+    @pytest.mark.parametrize('password, message', [
+        ('', 'required'),
+        ('Pa1!', 'at least 8 characters'),
+        ('password1!', 'uppercase'),
+        ('PASSWORD1!', 'lowercase'),
+        ('Password!!', 'number'),
+        ('Password11', 'special character'),
+        ('Password1~', 'special character'),   # ~ is not in the special set
+    ])
+    def test_missing_character_class(self, password, message):
+        """Test that the first missing character class is reported."""
+        with pytest.raises(ValidationError, match=message):
+            validate_password(password)
+
+
+class TestValidateBase64Image:
+    """Test cases for validate_base64_image."""
+
+    ENCODED = base64.b64encode(bytes(range(256))).decode('ascii')
+
+    def test_plain_base64(self):
+        """Test that unwrapped base64 is returned unchanged."""
+        assert validate_base64_image(self.ENCODED) == self.ENCODED
+
+    def test_wrapped_whitespace_removed(self):
+        """Test that line-wrapping whitespace is stripped."""
+        wrapped = '\r\n'.join(self.ENCODED[i:i + 76] for i in range(0, len(self.ENCODED), 76))
+
+        assert validate_base64_image(f' {wrapped}\n\t') == self.ENCODED
+
+    @pytest.mark.parametrize('prefix', ['data:image/png;base64,', 'data:image/jpeg;base64,'])
+    def test_data_uri_prefix_removed(self, prefix):
+        """Test that an image data URI prefix is stripped."""
+        assert validate_base64_image(prefix + self.ENCODED) == self.ENCODED
+
+    @pytest.mark.parametrize('value, message', [
+        ('', 'required'),
+        ('data:text/plain;base64,' + ENCODED, 'Invalid image format'),
+        (ENCODED[:-1], 'Invalid base64 encoding'),
+        ('abc*' + ENCODED, 'Invalid base64 encoding'),
+        ('é' + ENCODED, 'Invalid base64 encoding'),
+    ])
+    def test_invalid_images(self, value, message):
+        """Test that non-image data URIs and malformed base64 are rejected."""
+        with pytest.raises(ValidationError, match=message):
+            validate_base64_image(value)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])